@@ -0,0 +1,2 @@
+from backtest.engine import run_backtest, load_rounds, load_pools
+from backtest.simulator import SimulatedPrediction
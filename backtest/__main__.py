@@ -0,0 +1,56 @@
+import argparse
+
+from backtest.engine import load_pools, load_rounds, run_backtest
+from strategy.registry import STRATEGIES
+from utils.store import RoundStore
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replays the stored round history through a strategy.")
+    parser.add_argument("--strategy", choices=list(STRATEGIES.keys()), default="Trend")
+    parser.add_argument("--base-bet", type=float, default=0.001)
+    parser.add_argument("--factor", type=float, default=0.0, help="zero for auto factoring")
+    parser.add_argument("--safe-bet", type=float, default=0.2)
+    parser.add_argument("--bet-epochs", choices=["All", "Odd", "Even"], default="All")
+    parser.add_argument("--max-loss-threshold", type=float, default=0.0)
+    parser.add_argument("--max-consecutive-loss", type=int, default=0)
+    parser.add_argument("--gain-threshold", type=float, default=0.0)
+    parser.add_argument("--spend-threshold", type=float, default=0.0)
+    parser.add_argument("--from-epoch", type=int, default=None)
+    parser.add_argument("--to-epoch", type=int, default=None)
+    parser.add_argument("--store", default=None, help="round store path, [store] path by default")
+    parser.add_argument("--backfill", action="store_true",
+                        help="first fill the gaps of the round store, and their pool evolution, from the event logs")
+    args = parser.parse_args()
+
+    if args.backfill:
+        # only this needs the network, the replay itself runs offline
+        import pancake
+        psp = pancake.Prediction()
+        if args.store is not None:
+            psp.round_store = RoundStore(args.store)
+        filled = pancake.EventIngestor(psp).backfill(args.from_epoch, args.to_epoch)
+        print(f"Backfilled {filled} rounds.")
+
+    rounds = load_rounds(args.from_epoch, args.to_epoch, args.store)
+    pools = load_pools(args.from_epoch, args.to_epoch, args.store)
+    result = run_backtest(rounds, args.strategy, args.base_bet,
+                          factor=args.factor,
+                          safe_bet=args.safe_bet,
+                          bet_epochs=args.bet_epochs,
+                          max_loss_threshold=args.max_loss_threshold,
+                          max_consecutive_loss=args.max_consecutive_loss,
+                          gain_threshold=args.gain_threshold,
+                          spend_threshold=args.spend_threshold,
+                          pools=pools)
+
+    print(f"Rounds: {len(rounds)} ({len(pools)} with pools at bet time) - "
+          f"Bets: {result['bets']} (W {result['wins']} / L {result['losses']})")
+    print(f"Gain: {result['gain']:.5f} BNB - Max Drawdown: {result['max_drawdown']:.5f} BNB")
+    print(f"Max Stake: {result['max_stake']:.5f} BNB - Longest Loss Streak: {result['longest_loss_streak']}")
+    if result["stopped_at"] is not None:
+        print(f"Stop criteria triggered at epoch {result['stopped_at']}.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+
+from backtest.simulator import SimulatedPrediction
+from strategy import registry
+from strategy.context import build_context
+from utils.check import check_results, should_stop
+from utils.round import RoundArray
+from utils.store import RoundStore
+
+
+def load_rounds(from_epoch=None, to_epoch=None, path=None):
+    return RoundArray(RoundStore(path).get_range(from_epoch, to_epoch))
+
+
+def load_pools(from_epoch=None, to_epoch=None, path=None):
+    # pool evolution of the stored rounds backfilled from the event logs
+    return RoundStore(path).get_pools(from_epoch, to_epoch)
+
+
+def run_backtest(rounds: RoundArray, strategy_name, base_bet, factor=0.0, safe_bet=0.2, bet_epochs="All",
+                 max_loss_threshold=0.0, max_consecutive_loss=0, gain_threshold=0.0, spend_threshold=0.0,
+                 pools=None):
+    """
+    Replays the rounds through a strategy with the same martingale sizing and stop criteria as the bot.
+    Strategies and auto factoring see the pools at bet time for the rounds with a stored pool evolution
+    (`pools`). For the others, the final pools stand in for them, so auto factoring is slightly optimistic.
+    Epochs whose history window has a gap in the dataset are skipped.
+    Decisions are not logged, and the strategies only log their reasoning at debug level.
+    """
+    params = {"max_loss_threshold": max_loss_threshold,
+              "max_consecutive_loss": max_consecutive_loss,
+              "gain_threshold": gain_threshold,
+              "spend_threshold": spend_threshold}
+    states = registry.init_states([strategy_name])
+    back_in_time = registry.history_window([strategy_name])
+
+    psp = SimulatedPrediction(rounds, pools)
+    epochs = psp.rounds.epoch.tolist()
+    value = base_bet
+    stopped_at = None
+
+    # the first bet needs a full history window before it
+    for current_epoch in epochs[back_in_time + 2:]:
+        psp.set_epoch(current_epoch)
+        check_results(psp)
+
+        bet_status = psp.ledger.status()
+        if should_stop(params, bet_status):
+            stopped_at = current_epoch
+            break
+
+        if (bet_epochs == "All") \
+                or (current_epoch % 2 == 0 and bet_epochs == "Even") \
+                or (current_epoch % 2 == 1 and bet_epochs == "Odd"):
+            window = registry.history_window([strategy_name], current_epoch, states)
+            context = build_context(psp, current_epoch, window, round_stats=psp.get_bet_stats(current_epoch),
+                                    states=states)
+            if len(context.history) < window + 1:
+                # a gap in the dataset: the strategies only decide on a history contiguous up to
+                # current - 2, and their state is warmed up again past the gap
+                states = registry.init_states([strategy_name])
+                continue
+            position, value, trx_hash = registry.apply(strategy_name, psp, context,
+                                                       base_bet, value, factor, safe_bet, bet_status,
+                                                       verbose=False)
+
+    # settling the bets still open at the end of the dataset
+    if stopped_at is None and len(epochs) > 0:
+        psp.set_epoch(epochs[-1] + 2)
+        check_results(psp)
+
+    return summarize(psp.ledger.to_df(), stopped_at)
+
+
+def summarize(df_running, stopped_at=None):
+    df_running = df_running.sort_values("epoch").reset_index(drop=True)
+    rewards = df_running["reward"].to_numpy(dtype=float)
+    amounts = df_running["amount"].to_numpy(dtype=float)
+
+    pnl = pd.Series(np.cumsum(rewards), index=df_running["epoch"].to_numpy(), name="pnl")
+    drawdown = np.maximum.accumulate(np.concatenate([[0.0], pnl.to_numpy()]))[1:] - pnl.to_numpy()
+
+    longest_loss_streak = 0
+    streak = 0
+    for reward in rewards:
+        streak = streak + 1 if reward < 0 else 0
+        longest_loss_streak = max(longest_loss_streak, streak)
+
+    return {"pnl": pnl,
+            "gain": pnl.iloc[-1] if len(pnl) > 0 else 0.0,
+            "max_drawdown": drawdown.max() if len(drawdown) > 0 else 0.0,
+            "max_stake": amounts.max() if len(amounts) > 0 else 0.0,
+            "longest_loss_streak": longest_loss_streak,
+            "bets": len(rewards),
+            "wins": int((rewards > 0).sum()),
+            "losses": int((rewards < 0).sum()),
+            "stopped_at": stopped_at,
+            "df_running": df_running}
@@ -0,0 +1,57 @@
+import bisect
+
+from pancake import Prediction
+from utils.config import config
+from utils.round import RoundArray, get_round_stats
+
+
+class SimulatedPrediction(Prediction):
+    """
+    Offline stand-in for `Prediction` that serves rounds from a local dataset.
+    It is built offline and always runs in debug mode, so the inherited bet, claim and
+    result-checking methods only update the running history and never touch the network.
+    `pools` holds the pool evolution of the rounds that have one (see `RoundStore.get_pools`).
+    """
+
+    def __init__(self, rounds: RoundArray, pools=None):
+        super().__init__(offline=True)
+        self.debug = True
+
+        self.rounds = rounds.sort()
+        self._index = {epoch: i for i, epoch in enumerate(self.rounds.epoch.tolist())}
+        self.pools = {} if pools is None else pools
+
+    def set_epoch(self, epoch):
+        self.current_epoch = epoch
+
+    def is_paused(self):
+        return False
+
+    def get_balance(self):
+        return None
+
+    def get_min_bet(self):
+        return 0
+
+    def get_current_epoch(self):
+        return self.current_epoch
+
+    def get_round(self, epoch):
+        return self.rounds[self._index[epoch]]
+
+    def get_rounds(self, epochs):
+        # epochs missing from the dataset are left out
+        return self.rounds[[self._index[epoch] for epoch in epochs if epoch in self._index]]
+
+    def get_bet_stats(self, epoch):
+        """Stats of the round as the bot sees them at its bet time, [bet] seconds_left before lock, from the
+        pool evolution when the round has one. The result of a bet is still settled on the final pools."""
+        data = self.get_round(epoch)
+        entries = self.pools.get(epoch)
+        if entries:
+            bet_timestamp = data.lockTimestamp - config["bet"]["seconds_left"]
+            i = bisect.bisect_right([entry[0] for entry in entries], bet_timestamp)
+            bull_amount, bear_amount = (entries[i - 1][1], entries[i - 1][2]) if i > 0 else (0.0, 0.0)
+            data = data._replace(bullAmount=bull_amount, bearAmount=bear_amount,
+                                 totalAmount=bull_amount + bear_amount)
+        return get_round_stats(data)
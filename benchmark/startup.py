@@ -0,0 +1,111 @@
+"""
+Startup benchmark: for every section, the import time and the time to first render,
+each measured in a fresh interpreter so nothing is already imported or cached.
+
+    python benchmark/startup.py [--runs 3]
+
+The first render is the first element the section draws once it has read from the contract
+client (e.g. the wallet balance), so the client bootstrap and that first read are timed, as
+the user waits for them. The section stops right there. A section that never reads from the
+client (e.g. about) is timed to the end of its run. The client connects to the configured
+providers, so the benchmark needs the network.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SECTIONS = ["app", "daemon", "claim", "about"]
+
+SNIPPET = """
+import json
+import sys
+import time
+
+start = time.perf_counter()
+import streamlit as st
+from streamlit.delta_generator import DeltaGenerator
+
+import pancake
+
+
+class FirstRender(Exception):
+    pass
+
+
+# set once the section has waited on the contract client, its next element is the first one showing its data
+client_used = []
+wait_ready = pancake.Prediction._wait_ready
+
+
+def waited_ready(self):
+    wait_ready(self)
+    client_used.append(True)
+
+
+pancake.Prediction._wait_ready = waited_ready
+
+
+def until_client_used(element):
+    def first_render(*args, **kwargs):
+        if client_used:
+            raise FirstRender()
+        return element(*args, **kwargs)
+    return first_render
+
+
+# elements are drawn through the module, the sidebar, or containers such as columns and placeholders
+for element in ["title", "header", "subheader", "markdown", "caption", "write", "warning", "error", "info",
+                "success", "metric", "dataframe", "empty", "columns", "text_input", "text_area", "number_input",
+                "checkbox", "selectbox", "button", "download_button", "file_uploader"]:
+    setattr(DeltaGenerator, element, until_client_used(getattr(DeltaGenerator, element)))
+    setattr(st, element, until_client_used(getattr(st, element)))
+
+# main menu choice
+sidebar_selectbox = st.sidebar.selectbox
+st.sidebar.selectbox = lambda label, *args, **kwargs: \\
+    sys.argv[1] if label == "Main Menu" else sidebar_selectbox(label, *args, **kwargs)
+
+import main
+imported = time.perf_counter()
+
+import importlib
+section = importlib.import_module(f"sections.{sys.argv[1]}")
+section_imported = time.perf_counter()
+try:
+    main.main()
+except FirstRender:
+    pass
+rendered = time.perf_counter()
+
+print(json.dumps({"import": section_imported - start, "first_render": rendered - start,
+                  "client": len(client_used) > 0}))
+"""
+
+
+def measure(section):
+    output = subprocess.run([sys.executable, "-c", SNIPPET, section], cwd=parent_dir,
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'Section':<10}{'Import (s)':>14}{'First Render (s)':>20}{'Client':>10}")
+    for section in SECTIONS:
+        results = [measure(section) for _ in range(args.runs)]
+        import_time = statistics.median(result["import"] for result in results)
+        render_time = statistics.median(result["first_render"] for result in results)
+        client = "yes" if all(result["client"] for result in results) else "no"
+        print(f"{section:<10}{import_time:>14.3f}{render_time:>20.3f}{client:>10}")
+
+
+if __name__ == '__main__':
+    main()
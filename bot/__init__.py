@@ -0,0 +1,3 @@
+from bot.control import BotControl, list_bots
+from bot.runner import BotRunner
+from bot.multi import MultiRunner, load_instances
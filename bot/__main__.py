@@ -0,0 +1,70 @@
+import argparse
+import logging
+import os
+
+import pancake
+from bot.control import BotControl
+from bot.multi import MultiRunner, load_instances
+from bot.runner import BotRunner
+from strategy.registry import STRATEGIES
+
+PRIVATE_KEY_ENV = BotControl.PRIVATE_KEY_ENV
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Runs the betting bot without the Streamlit app. "
+                                                 f"The private key is read from ${PRIVATE_KEY_ENV}.")
+    parser.add_argument("--wallet-address", default=None)
+    parser.add_argument("--instances", default=None,
+                        help="toml file of [[instances]] run together, the other options are their defaults")
+    parser.add_argument("--strategy", choices=list(STRATEGIES.keys()), default="Trend")
+    parser.add_argument("--base-bet", type=float, default=0.001)
+    parser.add_argument("--factor", type=float, default=0.0, help="zero for auto factoring")
+    parser.add_argument("--safe-bet", type=float, default=0.2)
+    parser.add_argument("--bet-epochs", choices=["All", "Odd", "Even"], default="All")
+    parser.add_argument("--bet-estimated-timing", action=argparse.BooleanOptionalAction, default=True)
+    parser.add_argument("--max-loss-threshold", type=float, default=0.0)
+    parser.add_argument("--max-consecutive-loss", type=int, default=0)
+    parser.add_argument("--gain-threshold", type=float, default=0.0)
+    parser.add_argument("--spend-threshold", type=float, default=0.0)
+    parser.add_argument("--resume", action="store_true", help="continue from the positions of the last run")
+    parser.add_argument("--dir", default=None, help="state and control folder, [bot] dir by default")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    if args.wallet_address is None and args.instances is None:
+        parser.error("either --wallet-address or --instances is required")
+
+    params = {"wallet_address": args.wallet_address,
+              "bet_estimated_timing": args.bet_estimated_timing,
+              "strategy": args.strategy,
+              "bet_epochs": args.bet_epochs,
+              "base_bet": args.base_bet,
+              "factor": args.factor,
+              "safe_bet": args.safe_bet,
+              "max_loss_threshold": args.max_loss_threshold,
+              "max_consecutive_loss": args.max_consecutive_loss,
+              "gain_threshold": args.gain_threshold,
+              "spend_threshold": args.spend_threshold}
+
+    if args.instances is not None:
+        instances = load_instances(args.instances, defaults=params)
+        runner = MultiRunner(instances, path=args.dir, resume=args.resume)
+        print(f"Running {len(instances)} bots: {', '.join(instance['name'] for instance in instances)}", flush=True)
+        runner.run()
+        return
+
+    psp = pancake.Prediction(address=args.wallet_address, private_key=os.environ.get(PRIVATE_KEY_ENV))
+    control = BotControl(args.dir)
+    if args.resume:
+        df_running = control.load_running()
+        if df_running is not None:
+            psp.set_df_running(df_running)
+
+    runner = BotRunner(params, psp=psp, control=control)
+    print(f"Bot running with {args.strategy}, state in {control.path}", flush=True)
+    runner.run()
+    print(runner.message)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+import json
+import os
+import subprocess
+import sys
+import time
+
+import pandas as pd
+
+from utils.config import config, parent_dir
+
+
+class BotControl:
+    """
+    File-based link between a headless bot and whoever observes it (e.g. the Streamlit app).
+    The bot publishes its state to `state.json` and its positions to `running.csv`, and reads
+    commands ("pause", "resume", "stop") from `control.json`. Every file is replaced atomically,
+    so a reader never sees a partial write.
+    """
+
+    COMMANDS = ["pause", "resume", "stop"]
+    PRIVATE_KEY_ENV = "PANCAKE_PRIVATE_KEY"
+
+    def __init__(self, path: str = None):
+        if path is None:
+            path = config["bot"]["dir"]
+        if not os.path.isabs(path):
+            path = os.path.join(parent_dir, path)
+        os.makedirs(path, exist_ok=True)
+
+        self.path = path
+        self.state_file = os.path.join(path, "state.json")
+        self.control_file = os.path.join(path, "control.json")
+        self.running_file = os.path.join(path, "running.csv")
+        self.log_file = os.path.join(path, "bot.log")
+
+        # commands sent before the bot started are not for it
+        command = self._read_json(self.control_file)
+        self._last_command_id = 0 if command is None else command["id"]
+
+    # ---------------
+    # PUBLIC METHODS
+    # ---------------
+
+    def start(self, params, private_key=None, resume=False):
+        """Starts `python -m bot` in the background with the given bot parameters, logging to `bot.log`.
+        The private key is handed over through the environment, never on the command line or on disk."""
+        args = [sys.executable, "-m", "bot",
+                "--wallet-address", params["wallet_address"],
+                "--strategy", params["strategy"],
+                "--base-bet", str(params["base_bet"]),
+                "--factor", str(params["factor"]),
+                "--safe-bet", str(params["safe_bet"]),
+                "--bet-epochs", params["bet_epochs"],
+                "--bet-estimated-timing" if params["bet_estimated_timing"] else "--no-bet-estimated-timing",
+                "--max-loss-threshold", str(params["max_loss_threshold"]),
+                "--max-consecutive-loss", str(params["max_consecutive_loss"]),
+                "--gain-threshold", str(params["gain_threshold"]),
+                "--spend-threshold", str(params["spend_threshold"]),
+                "--dir", self.path]
+        if resume:
+            args.append("--resume")
+
+        env = dict(os.environ)
+        if private_key:
+            env[self.PRIVATE_KEY_ENV] = private_key
+
+        with open(self.log_file, "a") as log:
+            return subprocess.Popen(args, cwd=parent_dir, env=env, stdout=log, stderr=subprocess.STDOUT,
+                                    start_new_session=True)
+
+    def publish(self, state):
+        self._write_json(self.state_file, dict(state, updated=time.time()))
+
+    def read_state(self):
+        return self._read_json(self.state_file)
+
+    def is_alive(self, state=None):
+        # a running bot publishes at least every [heads] max_idle seconds
+        if state is None:
+            state = self.read_state()
+        return state is not None and state["status"] != "stopped" \
+            and time.time() - state["updated"] < config["bot"]["heartbeat_timeout"]
+
+    def send(self, command):
+        if command not in self.COMMANDS:
+            raise ValueError(f"Unknown bot command: {command}")
+        previous = self._read_json(self.control_file)
+        command_id = 1 if previous is None else previous["id"] + 1
+        self._write_json(self.control_file, {"id": command_id, "command": command, "time": time.time()})
+
+    def poll(self):
+        """The command sent since the last poll, or None."""
+        command = self._read_json(self.control_file)
+        if command is None or command["id"] <= self._last_command_id:
+            return None
+        self._last_command_id = command["id"]
+        return command["command"]
+
+    def save_running(self, df):
+        tmp_file = self.running_file + ".tmp"
+        df.to_csv(tmp_file, index=False)
+        os.replace(tmp_file, self.running_file)
+
+    def load_running(self):
+        if not os.path.exists(self.running_file):
+            return None
+        return pd.read_csv(self.running_file)
+
+    # ---------------
+    # PRIVATE METHODS
+    # ---------------
+
+    def _write_json(self, path, data):
+        tmp_file = path + ".tmp"
+        with open(tmp_file, "w") as outfile:
+            json.dump(data, outfile, default=str)
+        os.replace(tmp_file, path)
+
+    def _read_json(self, path):
+        try:
+            with open(path) as infile:
+                return json.load(infile)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+
+def list_bots(path: str = None):
+    """Names of the bots run together by `python -m bot --instances`, each publishing in its own subfolder."""
+    if path is None:
+        path = config["bot"]["dir"]
+    if not os.path.isabs(path):
+        path = os.path.join(parent_dir, path)
+    if not os.path.isdir(path):
+        return []
+    return sorted(name for name in os.listdir(path) if os.path.exists(os.path.join(path, name, "state.json")))
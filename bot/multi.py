@@ -0,0 +1,85 @@
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import toml
+
+import pancake
+from bot.control import BotControl
+from bot.runner import BotRunner
+from pancake.heads import BlockWatcher
+from utils.config import config, parent_dir
+
+logger = logging.getLogger(__name__)
+
+
+def load_instances(path, defaults=None):
+    """
+    Reads the `[[instances]]` tables of a toml file. Each one needs a unique `name` and a `wallet_address`,
+    takes any bot parameter (strategy, base_bet, factor, ...) over the given defaults, and names
+    the environment variable holding its private key in `private_key_env`.
+    """
+    if not os.path.isabs(path):
+        path = os.path.join(parent_dir, path)
+    instances = toml.load(path).get("instances", [])
+
+    names = [instance["name"] for instance in instances]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Instance names must be unique: {names}")
+
+    instances = [dict(defaults or {}, **instance) for instance in instances]
+    for instance in instances:
+        if not instance.get("wallet_address"):
+            raise ValueError(f"Instance {instance['name']} has no wallet_address")
+    return instances
+
+
+class MultiRunner:
+    """
+    Runs several bots in one process, each with its own wallet, strategy, sizing, stop criteria and positions.
+    Every bot gets a fork of one `Prediction`, so they all share the same connection, block watcher and
+    per-block caches: the current epoch, rounds and market data are read once per block however many
+    bots run. Each iteration steps all bots concurrently, so one sleeping until its bet time does not
+    delay the others. Bots publish and take commands in their own `[bot] dir/<name>` folder.
+    """
+
+    def __init__(self, instances, psp=None, path: str = None, resume: bool = False):
+        self.psp = pancake.Prediction() if psp is None else psp
+        if path is None:
+            path = config["bot"]["dir"]
+
+        self.runners = []
+        for instance in instances:
+            fork = self.psp.fork(instance["wallet_address"], os.environ.get(instance.get("private_key_env", "")))
+            control = BotControl(os.path.join(path, instance["name"]))
+            if resume:
+                df_running = control.load_running()
+                if df_running is not None:
+                    fork.set_df_running(df_running)
+            self.runners.append(BotRunner(instance, psp=fork, control=control))
+
+    # ---------------
+    # PUBLIC METHODS
+    # ---------------
+
+    def run(self):
+        watcher = BlockWatcher(self.psp.w3, on_head=self.psp.set_block_number)
+
+        with ThreadPoolExecutor(max_workers=max(1, len(self.runners))) as executor:
+            while True:
+                active = [runner for runner in self.runners if runner.status != "stopped"]
+                if len(active) == 0:
+                    break
+                list(executor.map(self._tick, active))
+                watcher.wait(min(runner.timeout() for runner in active))
+
+    # ---------------
+    # PRIVATE METHODS
+    # ---------------
+
+    def _tick(self, runner):
+        # a bot failing outside its step (e.g. publishing) is retried on the next block, the others go on
+        try:
+            runner.tick()
+        except Exception:
+            logger.exception("Bot %s failed, retrying on the next block", runner.params["name"])
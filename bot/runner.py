@@ -0,0 +1,161 @@
+import datetime as dt
+import logging
+import os
+
+import pancake
+from bot.control import BotControl
+from pancake.heads import BlockWatcher
+from strategy import registry
+from strategy.context import build_context
+from utils.check import check_results, should_stop
+from utils.config import config
+
+logger = logging.getLogger(__name__)
+
+
+class BotRunner:
+    """
+    The betting loop, independent of any UI.
+    `params` holds the same settings as the bot sidebar (strategy, sizing, timing and stop criteria).
+    `step` runs one iteration and is shared with the in-page loop of the Streamlit app, while `run`
+    drives it headless, waking up on new blocks and publishing its state through a `BotControl`.
+    """
+
+    def __init__(self, params, psp=None, control: BotControl = None):
+        self.params = params
+        self.psp = pancake.Prediction() if psp is None else psp
+        self.control = control
+
+        self.states = registry.init_states([params["strategy"]])
+        self.value = params["base_bet"]
+        self.i_bet = 0
+        self.bet_time = None
+        self.status = "running"
+        self.message = ""
+
+        self._saved_version = None
+
+    # ---------------
+    # PUBLIC METHODS
+    # ---------------
+
+    def step(self):
+        """One iteration of the loop. Returns False once the stop criteria are met."""
+        psp = self.psp
+        params = self.params
+
+        if should_stop(params, psp.ledger.status()):
+            self.status = "stopped"
+            self.message = "Stop criteria triggered."
+            return False
+
+        current_epoch = psp.get_current_epoch()
+        # the round and the history the strategy needs are read concurrently, then served from the caches
+        psp.prefetch(current_epoch, back_in_time=registry.history_window([params["strategy"]], current_epoch,
+                                                                          self.states))
+        round_stats = psp.get_round_stats(current_epoch)
+
+        if params["bet_estimated_timing"]:
+            self.bet_time = psp.bet_time
+        else:
+            self.bet_time = round_stats["round_bet_time"]
+
+        bet_epochs = params["bet_epochs"]
+        is_bet_epoch = (bet_epochs == "All") \
+            or (current_epoch % 2 == 0 and bet_epochs == "Even") \
+            or (current_epoch % 2 == 1 and bet_epochs == "Odd")
+
+        if is_bet_epoch and current_epoch not in psp.ledger:
+            # both bets are signed ahead at their expected stakes, so betting at the deadline only broadcasts,
+            # and signed again on a new block if the pools moved an auto factor stake
+            check_results(psp)
+            psp.prepare_bets(current_epoch,
+                             registry.expected_values(psp, current_epoch, round_stats, params["base_bet"],
+                                                      self.value, params["factor"], params["safe_bet"]))
+
+        # the last stretch before the bet time is slept on the round clock, not in block-sized steps
+        seconds_to_bet = (self.bet_time - dt.datetime.now()).total_seconds()
+        if 0 < seconds_to_bet <= config["clock"]["schedule_ahead"]:
+            psp.clock.sleep_until(self.bet_time)
+
+        if dt.datetime.now() >= self.bet_time:
+            check_results(psp)
+
+            if current_epoch not in psp.ledger:
+                if is_bet_epoch:
+                    bet_status = psp.ledger.status()
+                    self.i_bet += 1
+
+                    strategy_name = params["strategy"]
+                    back_in_time = registry.history_window([strategy_name], current_epoch, self.states)
+                    context = build_context(psp, current_epoch,
+                                            back_in_time=back_in_time,
+                                            round_stats=round_stats,
+                                            states=self.states)
+                    position, self.value, trx_hash = registry.apply(strategy_name, psp, context,
+                                                                    params["base_bet"], self.value,
+                                                                    params["factor"], params["safe_bet"],
+                                                                    bet_status)
+                    self.message = f"Bet #{self.i_bet} - Value: {self.value} - Position: {position} - Trx: {trx_hash}"
+                else:
+                    self.message = "Skipped"
+        return True
+
+    def timeout(self):
+        # nothing changes on chain between blocks, so the loop sleeps until
+        # a new block arrives or the bet time comes, whichever is first
+        timeout = config["heads"]["max_idle"]
+        if self.bet_time is not None:
+            seconds_to_bet = (self.bet_time - dt.datetime.now()).total_seconds()
+            if seconds_to_bet > 0:
+                timeout = min(timeout, seconds_to_bet)
+        return timeout
+
+    def tick(self):
+        """Handles the pending command, runs a step unless paused and publishes the state.
+        A failing step is logged and published, and retried on the next block: only a stop command
+        or the stop criteria stop the bot. Returns False once the bot is stopped."""
+        command = self.control.poll()
+        if command == "stop":
+            self.status = "stopped"
+            self.message = "Stopped."
+        elif command in ("pause", "resume"):
+            self.status = "paused" if command == "pause" else "running"
+
+        try:
+            if self.status == "running":
+                self.step()
+        except Exception as exc:
+            logger.exception("Bot step failed, retrying on the next block")
+            self.message = f"Error: {exc} - retrying on the next block"
+        finally:
+            self.publish()
+        return self.status != "stopped"
+
+    def run(self):
+        if self.control is None:
+            self.control = BotControl()
+        watcher = BlockWatcher(self.psp.w3, on_head=self.psp.set_block_number)
+
+        while self.tick():
+            watcher.wait(self.timeout())
+
+    def publish(self):
+        psp = self.psp
+        if self._saved_version != (id(psp.ledger), psp.ledger.version):
+            self.control.save_running(psp.get_running_df())
+            self._saved_version = (id(psp.ledger), psp.ledger.version)
+
+        self.control.publish({"status": self.status,
+                              "pid": os.getpid(),
+                              "message": self.message,
+                              "address": psp.address,
+                              "strategy": self.params["strategy"],
+                              "current_epoch": psp.current_epoch,
+                              "bet_time": self.bet_time,
+                              "lock_time": psp.lock_time,
+                              "bets": self.i_bet,
+                              "value": self.value,
+                              "bet_status": psp.ledger.status(),
+                              "params": {key: value for key, value in self.params.items()
+                                         if key not in ("private_key", "psp")}})
@@ -1,9 +1,8 @@
+import importlib
 import streamlit as st
-import sections.app
-import sections.about
-import sections.claim
 
 menu_list = {"app": "Bot App",
+             "daemon": "Bot Daemon",
              "claim": "Claim Rewards",
              "about": "About"}
 
@@ -18,12 +17,9 @@ def main():
                                         options=list(menu_list.keys()),
                                         format_func=lambda x: get_app_code(x))
     # st.header(getAppCode(selected_app))
-    if selected_app == "app":
-        sections.app.main()
-    elif selected_app == "claim":
-        sections.claim.main()
-    elif selected_app == "about":
-        sections.about.main()
+    # only the selected section is imported, the others never load their dependencies
+    section = importlib.import_module(f"sections.{selected_app}")
+    section.main()
 
     # eval(selected_app + "()")
 
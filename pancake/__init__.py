@@ -1 +1,2 @@
 from pancake.prediction import Prediction
+from pancake.events import EventIngestor
@@ -0,0 +1,163 @@
+import math
+from concurrent.futures import Future
+
+from utils.config import config
+
+
+class ClaimChunk:
+    """One claim transaction: its epochs, gas limit, hash and a future resolving to its receipt."""
+
+    __slots__ = ("epochs", "gas", "tx_hash", "receipt")
+
+    def __init__(self, epochs, gas, tx_hash=None, receipt=None):
+        self.epochs = epochs
+        self.gas = gas
+        self.tx_hash = tx_hash
+        self.receipt = receipt
+
+    @property
+    def done(self):
+        return self.receipt is not None and self.receipt.done()
+
+    @property
+    def succeeded(self):
+        # None while the transaction is pending
+        if not self.done:
+            return None
+        return self.receipt.exception() is None and self.receipt.result()["status"] == 1
+
+
+class ClaimPipeline:
+    """
+    Claims many epochs in as few transactions as the gas limits allow.
+    The gas of a claim grows linearly with its number of epochs, so two estimates (one epoch and a sample
+    of several) give the base and per-epoch cost. Epochs are split into the largest chunks fitting under
+    [claim] max_gas, sent back-to-back with nonces from the `NonceManager`, and their receipts are awaited
+    by the `ReceiptTracker`.
+    Epochs not confirmed claimable are checked first and the others are skipped, since a single one
+    makes the estimate and the claim revert. If an estimate reverts anyway, [claim] default_gas is used.
+    A reverted chunk gets its epochs' claim hash cleared in the ledger, so they are claimed again later.
+    """
+
+    def __init__(self, psp, max_gas: int = None, max_epochs: int = None, gas_margin: float = None):
+        self.psp = psp
+        self.max_gas = config["claim"]["max_gas"] if max_gas is None else max_gas
+        self.max_epochs = config["claim"]["max_epochs"] if max_epochs is None else max_epochs
+        self.gas_margin = config["claim"]["gas_margin"] if gas_margin is None else gas_margin
+        self.sample_size = config["claim"]["sample_size"]
+
+        self.base_gas = None
+        self.epoch_gas = None
+        self.chunks = []
+        self.skipped = []
+
+    # ---------------
+    # PUBLIC METHODS
+    # ---------------
+
+    def estimate(self, epochs):
+        """Fits the gas of a claim as `base_gas + epoch_gas * len(epochs)` and returns both."""
+        if self.psp.debug:
+            self.base_gas, self.epoch_gas = config["claim"]["default_gas"]
+            return self.base_gas, self.epoch_gas
+
+        try:
+            single = self._estimate_gas(epochs[:1])
+            sample = epochs[:min(len(epochs), self.sample_size)]
+            if len(sample) > 1:
+                self.epoch_gas = max(1, (self._estimate_gas(sample) - single) / (len(sample) - 1))
+            else:
+                # nothing to compare with, the whole single claim is charged per epoch
+                self.epoch_gas = single
+            self.base_gas = max(0, single - self.epoch_gas)
+        except Exception:
+            # the claim reverts (e.g. an epoch claimed meanwhile), the chunk will revert too and be retried
+            self.base_gas, self.epoch_gas = config["claim"]["default_gas"]
+        return self.base_gas, self.epoch_gas
+
+    def gas_for(self, n_epochs):
+        return math.ceil((self.base_gas + self.epoch_gas * n_epochs) * self.gas_margin)
+
+    def plan(self, epochs):
+        """Splits the epochs into the fewest chunks under the gas and size limits, evenly sized."""
+        epochs = sorted(set(epochs))
+        if len(epochs) == 0:
+            return []
+        if self.base_gas is None:
+            self.estimate(epochs)
+
+        per_chunk = int((self.max_gas / self.gas_margin - self.base_gas) // self.epoch_gas)
+        per_chunk = max(1, min(per_chunk, self.max_epochs))
+        n_chunks = math.ceil(len(epochs) / per_chunk)
+        size = math.ceil(len(epochs) / n_chunks)
+        return [epochs[i:i + size] for i in range(0, len(epochs), size)]
+
+    def submit(self, epochs, checked: bool = False):
+        """
+        Sends one claim per planned chunk without waiting for any receipt, and returns the chunks.
+        Unless `checked`, the epochs are confirmed claimable first, and the others are kept in `skipped`.
+        """
+        if not checked and not self.psp.debug:
+            claimable = set(self.psp.get_claimable(epochs))
+            self.skipped = [epoch for epoch in epochs if epoch not in claimable]
+            epochs = [epoch for epoch in epochs if epoch in claimable]
+        planned = self.plan(epochs)
+        if len(planned) == 0:
+            return []
+
+        if self.psp.debug:
+            chunks = []
+            for epoch_chunk in planned:
+                receipt = Future()
+                receipt.set_result({"status": 1, "gasUsed": self.gas_for(len(epoch_chunk))})
+                chunks.append(ClaimChunk(epoch_chunk, self.gas_for(len(epoch_chunk)),
+                                         tx_hash="trx_claim_hash_sample_string", receipt=receipt))
+                self._set_claim_hash(epoch_chunk, "trx_claim_hash_sample_string")
+        else:
+            gas_price = self.psp.w3.eth.gas_price
+            chunks = []
+            for epoch_chunk in planned:
+                chunk = ClaimChunk(epoch_chunk, self.gas_for(len(epoch_chunk)))
+                chunk.tx_hash = self.psp.send_transaction(self.psp.prediction_contract.functions.claim(epoch_chunk),
+                                                          gas=chunk.gas, gas_price=gas_price)
+                # recorded before tracking, so a revert seen right away is not overwritten
+                self._set_claim_hash(chunk.epochs, chunk.tx_hash)
+                chunk.receipt = self.psp.receipt_tracker.track(
+                    chunk.tx_hash, lambda receipt, chunk=chunk: self._on_receipt(chunk, receipt))
+                chunks.append(chunk)
+
+        self.chunks += chunks
+        return chunks
+
+    def wait(self, timeout=None):
+        """Blocks until every submitted chunk is mined and returns the chunks that reverted or timed out."""
+        failed = []
+        for chunk in self.chunks:
+            try:
+                receipt = chunk.receipt.result(timeout=timeout)
+            except Exception:
+                failed.append(chunk)
+                continue
+            if receipt["status"] != 1:
+                failed.append(chunk)
+        return failed
+
+    def pending(self):
+        return [chunk for chunk in self.chunks if not chunk.done]
+
+    # ---------------
+    # PRIVATE METHODS
+    # ---------------
+
+    def _estimate_gas(self, epochs):
+        return self.psp.prediction_contract.functions.claim(epochs).estimate_gas({'from': self.psp.address})
+
+    def _on_receipt(self, chunk, receipt):
+        if receipt["status"] != 1:
+            self._set_claim_hash(chunk.epochs, "")
+
+    def _set_claim_hash(self, epochs, claim_hash):
+        # epochs from an uploaded file may not be in this session's ledger
+        for epoch in epochs:
+            if epoch in self.psp.ledger:
+                self.psp.ledger.set_claim_hash(epoch, claim_hash)
@@ -0,0 +1,91 @@
+import datetime as dt
+import threading
+import time
+from collections import deque
+
+from utils.config import config
+
+
+class RoundClock:
+    """
+    Maps chain time to the local clock and schedules the bet of the current round.
+    The offset between both clocks is the smallest gap seen between a block's arrival and its timestamp,
+    over the last [clock] window blocks. The smallest gap is the one least inflated by propagation delays.
+    The usual delay between a round's lockTimestamp and its actual lock (the start of the next round),
+    and the time between sending a transaction and the timestamp of its block, are learned as moving averages.
+    A bet is fired `margin` seconds plus the inclusion time before lockTimestamp, the last second the
+    contract accepts bets, by a coarse sleep followed by a busy wait on the high-resolution counter.
+    """
+
+    def __init__(self, margin: float = None, window: int = None):
+        self.margin = config["bet"]["seconds_left_at_estimated_time"] if margin is None else margin
+        self.window = config["clock"]["window"] if window is None else window
+        self.alpha = config["clock"]["alpha"]
+        self.spin = config["clock"]["spin"]
+
+        self.lock_delay = config["clock"]["lock_delay"]
+        self.inclusion = config["clock"]["inclusion"]
+
+        self._gaps = deque(maxlen=self.window)
+        self._observed_locks = deque(maxlen=self.window)
+        self._lock = threading.Lock()
+
+    # ---------------
+    # PUBLIC METHODS
+    # ---------------
+
+    @property
+    def offset(self):
+        # local time minus chain time, zero until a block was seen
+        with self._lock:
+            return min(self._gaps) if len(self._gaps) > 0 else 0.0
+
+    def observe_block(self, timestamp, received_at=None):
+        if received_at is None:
+            received_at = time.time()
+        with self._lock:
+            self._gaps.append(received_at - timestamp)
+
+    def observe_lock(self, lock_timestamp, next_start_timestamp):
+        # the next round starts in the transaction locking this one, each lock is one sample
+        # however many forks sharing this clock report it
+        if lock_timestamp > 0 and next_start_timestamp >= lock_timestamp:
+            with self._lock:
+                if lock_timestamp in self._observed_locks:
+                    return
+                self._observed_locks.append(lock_timestamp)
+                self.lock_delay = self._average(self.lock_delay, next_start_timestamp - lock_timestamp)
+
+    def observe_inclusion(self, sent_at, block_timestamp):
+        self.inclusion = self._average(self.inclusion, max(0.0, self.to_local(block_timestamp) - sent_at))
+
+    def chain_now(self):
+        return time.time() - self.offset
+
+    def to_local(self, timestamp):
+        return timestamp + self.offset
+
+    def to_datetime(self, timestamp):
+        return dt.datetime.fromtimestamp(self.to_local(timestamp))
+
+    def fire_at(self, lock_timestamp):
+        """Local time to send a bet for a round locking at the given chain timestamp."""
+        return self.to_local(lock_timestamp) - self.inclusion - self.margin
+
+    def sleep_until(self, target):
+        """Sleeps until the given local time (a timestamp or a datetime), sub-millisecond accurate."""
+        if isinstance(target, dt.datetime):
+            target = target.timestamp()
+        remaining = target - time.time()
+        if remaining > self.spin:
+            time.sleep(remaining - self.spin)
+        deadline = time.perf_counter() + (target - time.time())
+        while time.perf_counter() < deadline:
+            pass
+
+    # ---------------
+    # PRIVATE METHODS
+    # ---------------
+
+    def _average(self, average, value):
+        return (1 - self.alpha) * average + self.alpha * value
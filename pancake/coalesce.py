@@ -0,0 +1,90 @@
+import threading
+import time
+from concurrent.futures import Future
+
+
+class BlockCache:
+    """
+    Coalesces reads of mutable contract state within one block.
+    A value read at the latest known block is served from memory until a new block arrives,
+    and identical reads in flight at the same time share a single request.
+    The latest block number is pushed by a block watcher when there is one, otherwise it is
+    fetched again once it is older than `block_ttl` seconds.
+    """
+
+    def __init__(self, get_block_number, block_ttl: float):
+        self.get_block_number = get_block_number
+        self.block_ttl = block_ttl
+
+        self.hits = 0
+        self.misses = 0
+
+        self._block_number = None
+        self._block_time = 0
+        self._values = {}
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def set_block_number(self, block_number):
+        with self._lock:
+            if self._block_number is None or block_number >= self._block_number:
+                self._block_number = block_number
+                self._block_time = time.monotonic()
+
+    def block_number(self):
+        with self._lock:
+            if self._block_number is not None and time.monotonic() - self._block_time < self.block_ttl:
+                return self._block_number
+        return self._coalesce(("blockNumber",), None, self._fetch_block_number)
+
+    def get(self, key, fetch):
+        return self._coalesce(key, self.block_number(), fetch)
+
+    def invalidate(self, key=None):
+        with self._lock:
+            if key is None:
+                self._values.clear()
+            else:
+                self._values.pop(key, None)
+
+    # ---------------
+    # PRIVATE METHODS
+    # ---------------
+
+    def _fetch_block_number(self):
+        block_number = self.get_block_number()
+        self.set_block_number(block_number)
+        return block_number
+
+    def _coalesce(self, key, block_number, fetch):
+        with self._lock:
+            if block_number is not None and key in self._values and self._values[key][0] == block_number:
+                self.hits += 1
+                return self._values[key][1]
+
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                self.misses += 1
+                future = Future()
+                self._inflight[key] = future
+            else:
+                self.hits += 1
+
+        if not owner:
+            return future.result()
+
+        try:
+            value = fetch()
+        except Exception as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(value)
+            if block_number is not None:
+                with self._lock:
+                    self._values[key] = (block_number, value)
+            return value
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
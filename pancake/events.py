@@ -0,0 +1,261 @@
+from collections import defaultdict
+
+from eth_abi import decode as abi_decode
+from eth_utils import event_abi_to_log_topic
+from hexbytes import HexBytes
+from web3 import Web3
+
+from utils.config import config
+from utils.round import Round, RoundArray
+
+
+class EventIngestor:
+    """
+    Rebuilds round history and per-epoch pool evolution from the contract's event logs.
+    Logs are pulled with eth_getLogs over adaptive block ranges: a range the node rejects is halved,
+    and a range that succeeds lets the next one grow, within [events] min_chunk and max_chunk.
+    `backfill` fills the gaps of the round store this way, along with the pool evolution of every
+    rebuilt round, which `rounds()` cannot provide as it only holds the final pools.
+    """
+
+    EVENTS = ["StartRound", "LockRound", "EndRound", "RewardsCalculated", "BetBull", "BetBear", "Claim"]
+    # interpolation steps searching the block of a timestamp, the range found is still valid if they run out
+    SEARCH_STEPS = 32
+
+    def __init__(self, psp, chunk_size: int = None):
+        self.psp = psp
+        self.w3 = psp.w3
+        self.contract = psp.prediction_contract
+
+        self.chunk_size = config["events"]["chunk_size"] if chunk_size is None else chunk_size
+        self.min_chunk = config["events"]["min_chunk"]
+        self.max_chunk = config["events"]["max_chunk"]
+        self.max_rounds = config["events"]["max_rounds"]
+        self.block_margin = config["events"]["block_margin"]
+
+        # topic0 -> event name, indexed and data arguments, to decode a batch of logs of one event at once
+        self.layouts = {}
+        for name in self.EVENTS:
+            abi = getattr(self.contract.events, name)().abi
+            indexed = [(arg["name"], arg["type"]) for arg in abi["inputs"] if arg["indexed"]]
+            data = [(arg["name"], arg["type"]) for arg in abi["inputs"] if not arg["indexed"]]
+            self.layouts[event_abi_to_log_topic(abi)] = (name, indexed, data)
+
+        self.interval_seconds = None
+        self._block_timestamps = {}
+
+    # ---------------
+    # PUBLIC METHODS
+    # ---------------
+
+    def fetch_logs(self, from_block, to_block):
+        logs = []
+        start = from_block
+        while start <= to_block:
+            end = min(start + self.chunk_size - 1, to_block)
+            try:
+                logs += self.w3.eth.get_logs({"address": self.contract.address,
+                                              "fromBlock": start,
+                                              "toBlock": end,
+                                              "topics": [list(self.layouts.keys())]})
+            except Exception:
+                if self.chunk_size <= self.min_chunk:
+                    raise
+                self.chunk_size = max(self.min_chunk, self.chunk_size // 2)
+                continue
+
+            start = end + 1
+            self.chunk_size = min(self.max_chunk, self.chunk_size * 2)
+        return logs
+
+    def decode(self, logs):
+        """
+        Decodes a batch of logs with one ABI decode per event: every event of interest only has static
+        arguments, so the data of all its logs decodes at once, and so do their indexed topics.
+        Returns `{"event", "args", "blockNumber"}` dicts, in the order of the logs.
+        """
+        groups = defaultdict(list)
+        for i, log in enumerate(logs):
+            topic = bytes(HexBytes(log["topics"][0]))
+            if topic in self.layouts:
+                groups[topic].append((i, log))
+
+        decoded = []
+        for topic, group in groups.items():
+            name, indexed, data = self.layouts[topic]
+            topics = b"".join(bytes(HexBytes(value)) for _, log in group for value in log["topics"][1:])
+            topic_values = abi_decode([arg_type for _, arg_type in indexed] * len(group), topics)
+            data_values = abi_decode([arg_type for _, arg_type in data] * len(group),
+                                     b"".join(bytes(HexBytes(log["data"])) for _, log in group))
+            for j, (i, log) in enumerate(group):
+                args = dict(zip([arg_name for arg_name, _ in indexed],
+                                topic_values[j * len(indexed):(j + 1) * len(indexed)]))
+                args.update(zip([arg_name for arg_name, _ in data], data_values[j * len(data):(j + 1) * len(data)]))
+                decoded.append((i, {"event": name, "args": args, "blockNumber": log["blockNumber"]}))
+
+        decoded.sort(key=lambda item: item[0])
+        return [event for _, event in decoded]
+
+    def ingest(self, from_block, to_block):
+        """
+        Ingests the logs between both blocks (inclusive) and returns the rebuilt rounds, their pool evolution
+        `{epoch: [(timestamp, bull_amount, bear_amount), ...]}` and the claims `[(sender, epoch, amount), ...]`.
+        Rounds started, locked and ended within the range are complete, and they are saved to the round store
+        with their pool evolution. The timestamp of a block with bets is interpolated between the round's
+        start and lock blocks, so only those two are read.
+        """
+        events = self.decode(self.fetch_logs(from_block, to_block))
+
+        start_blocks, locks, ends, rewards = {}, {}, {}, {}
+        bets = defaultdict(list)
+        claims = []
+        bull_amount = defaultdict(int)
+        bear_amount = defaultdict(int)
+
+        for event in events:
+            name = event["event"]
+            args = event["args"]
+            if name == "StartRound":
+                start_blocks[args["epoch"]] = event["blockNumber"]
+            elif name == "LockRound":
+                locks[args["epoch"]] = (event["blockNumber"], args["price"])
+            elif name == "EndRound":
+                ends[args["epoch"]] = args["price"]
+            elif name == "RewardsCalculated":
+                rewards[args["epoch"]] = (args["rewardBaseCalAmount"], args["rewardAmount"])
+            elif name in ("BetBull", "BetBear"):
+                epoch = args["epoch"]
+                if name == "BetBull":
+                    bull_amount[epoch] += args["amount"]
+                else:
+                    bear_amount[epoch] += args["amount"]
+                bets[epoch].append((event["blockNumber"],
+                                    float(Web3.from_wei(bull_amount[epoch], 'ether')),
+                                    float(Web3.from_wei(bear_amount[epoch], 'ether'))))
+            elif name == "Claim":
+                claims.append((args["sender"], args["epoch"], float(Web3.from_wei(args["amount"], 'ether'))))
+
+        complete = sorted(epoch for epoch in start_blocks if epoch in locks and epoch in ends)
+        rounds = [self._build_round(epoch, start_blocks[epoch], locks[epoch], ends[epoch],
+                                    bull_amount[epoch], bear_amount[epoch], rewards.get(epoch, (0, 0)))
+                  for epoch in complete]
+        pools = {epoch: self._pool_evolution(bets[epoch], start_blocks[epoch], locks[epoch][0])
+                 for epoch in complete if epoch in bets}
+        self.psp.round_store.save_many(rounds)
+        self.psp.round_store.save_pools(pools)
+
+        return {"rounds": RoundArray(rounds),
+                "pools": pools,
+                "claims": claims}
+
+    def ingest_recent(self, blocks):
+        latest = self.w3.eth.block_number
+        return self.ingest(max(0, latest - blocks + 1), latest)
+
+    def backfill(self, from_epoch=None, to_epoch=None):
+        """
+        Fills the gaps of the round store between both epochs (inclusive), by default from the oldest stored
+        round to the latest settled one, from the logs of the blocks each gap spans, in gaps of at most
+        [events] max_rounds rounds. A round the logs do not rebuild (e.g. cancelled, so never ended) is read
+        with `rounds()` instead. Returns the number of epochs filled.
+        """
+        store = self.psp.round_store
+        if to_epoch is None:
+            to_epoch = self.psp.get_current_epoch() - 2
+        if from_epoch is None:
+            from_epoch = store.min_epoch() or to_epoch
+        missing = store.missing(from_epoch, to_epoch)
+        if len(missing) == 0:
+            return 0
+
+        latest = self.w3.eth.get_block("latest")
+        for first, last in self._gaps(missing):
+            # a round starts in one block, is locked when the next one starts and ends when the one after starts
+            first_round, end_round = self.psp.multicall.call([self.contract.functions.rounds(first),
+                                                              self.contract.functions.rounds(last + 2)])
+            from_block = self._block_range(first_round[1], latest)[0]
+            to_block = self._block_range(end_round[1], latest)[1]
+            self.ingest(max(0, from_block - self.block_margin), min(latest["number"], to_block + self.block_margin))
+
+        left = store.missing(from_epoch, to_epoch)
+        if len(left) > 0:
+            self.psp.get_rounds(left)
+        return len(missing) - len(store.missing(from_epoch, to_epoch))
+
+    # ---------------
+    # PRIVATE METHODS
+    # ---------------
+
+    def _gaps(self, epochs):
+        # runs of consecutive epochs, as (first, last) pairs of at most max_rounds epochs
+        gaps = []
+        for epoch in epochs:
+            if len(gaps) > 0 and epoch == gaps[-1][1] + 1 and epoch - gaps[-1][0] < self.max_rounds:
+                gaps[-1][1] = epoch
+            else:
+                gaps.append([epoch, epoch])
+        return [tuple(gap) for gap in gaps]
+
+    def _block_range(self, timestamp, latest):
+        # the blocks around the given timestamp, found by interpolation between two bracketing blocks,
+        # as the block time changed over the chain's history
+        low, low_time = 0, self._get_block_timestamp(0)
+        high, high_time = latest["number"], latest["timestamp"]
+        if timestamp >= high_time:
+            return high, high
+        for step in range(self.SEARCH_STEPS):
+            if high - low <= 1 or high_time == low_time:
+                break
+            if step % 2 == 0:
+                guess = low + int((timestamp - low_time) * (high - low) / (high_time - low_time))
+            else:
+                # bisecting every other step, so a bound stuck on one side still halves the range
+                guess = (low + high) // 2
+            guess = min(high - 1, max(low + 1, guess))
+            guess_time = self._get_block_timestamp(guess)
+            if guess_time <= timestamp:
+                low, low_time = guess, guess_time
+            else:
+                high, high_time = guess, guess_time
+        return low, high
+
+    def _pool_evolution(self, bets, start_block, lock_block):
+        # pools after the last bet of every block, the timestamps on a straight line from start to lock
+        start_time = self._get_block_timestamp(start_block)
+        lock_time = self._get_block_timestamp(lock_block)
+        block_time = (lock_time - start_time) / (lock_block - start_block) if lock_block > start_block else 0
+
+        last_by_block = {}
+        for block, bull_amount, bear_amount in bets:
+            last_by_block[block] = (bull_amount, bear_amount)
+        return [(int(start_time + (block - start_block) * block_time), bull_amount, bear_amount)
+                for block, (bull_amount, bear_amount) in sorted(last_by_block.items())]
+
+    def _build_round(self, epoch, start_block, lock, end_price, bull_amount, bear_amount, reward):
+        # same values the contract stores: lock is scheduled one interval after the start,
+        # and close one interval after the actual lock
+        if self.interval_seconds is None:
+            self.interval_seconds = self.contract.functions.intervalSeconds().call()
+        lock_block, lock_price = lock
+        start_timestamp = self._get_block_timestamp(start_block)
+
+        return Round(epoch=epoch,
+                     startTimestamp=start_timestamp,
+                     lockTimestamp=start_timestamp + self.interval_seconds,
+                     closeTimestamp=self._get_block_timestamp(lock_block) + self.interval_seconds,
+                     lockPrice=lock_price / 100000000,
+                     closePrice=end_price / 100000000,
+                     lockOracleId=0,
+                     closeOracleId=0,
+                     totalAmount=float(Web3.from_wei(bull_amount + bear_amount, 'ether')),
+                     bullAmount=float(Web3.from_wei(bull_amount, 'ether')),
+                     bearAmount=float(Web3.from_wei(bear_amount, 'ether')),
+                     rewardBaseCalAmount=float(Web3.from_wei(reward[0], 'ether')),
+                     rewardAmount=float(Web3.from_wei(reward[1], 'ether')),
+                     oracleCalled=True)
+
+    def _get_block_timestamp(self, block_number):
+        # the lock of one round and the start of the next share a block, so timestamps are reused
+        if block_number not in self._block_timestamps:
+            self._block_timestamps[block_number] = self.w3.eth.get_block(block_number)["timestamp"]
+        return self._block_timestamps[block_number]
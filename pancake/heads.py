@@ -0,0 +1,95 @@
+import asyncio
+import threading
+import time
+
+from web3 import AsyncWeb3, WebsocketProviderV2
+
+from utils.config import config
+
+
+class BlockWatcher:
+    """
+    Signals new block heads.
+    With a [heads] ws_provider, heads are pushed through an `eth_subscribe("newHeads")` subscription
+    running in a background thread. Otherwise, or once the subscription drops, the latest block number
+    is polled every [heads] poll_interval seconds while someone is waiting.
+    `on_head` is called with the number and timestamp of every new block.
+    """
+
+    def __init__(self, w3, ws_provider: str = None, poll_interval: float = None, on_head=None):
+        self.w3 = w3
+        self.on_head = on_head
+        self.ws_provider = config["heads"]["ws_provider"] if ws_provider is None else ws_provider
+        self.poll_interval = config["heads"]["poll_interval"] if poll_interval is None else poll_interval
+
+        self.block_number = None
+        self._seen = None
+        self._condition = threading.Condition()
+        self._subscribed = False
+
+        if self.ws_provider:
+            self._subscribed = True
+            threading.Thread(target=self._run_subscription, daemon=True).start()
+
+    def wait(self, timeout):
+        """Blocks until a block newer than the last one returned arrives, or the timeout expires.
+        Returns the new block number, or None on timeout."""
+        deadline = time.monotonic() + max(0, timeout)
+        with self._condition:
+            while True:
+                if self.block_number is not None and self.block_number != self._seen:
+                    self._seen = self.block_number
+                    return self._seen
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+
+                if self._subscribed:
+                    self._condition.wait(remaining)
+                else:
+                    self._condition.release()
+                    try:
+                        self._poll(remaining)
+                    finally:
+                        self._condition.acquire()
+
+    # ---------------
+    # PRIVATE METHODS
+    # ---------------
+
+    def _poll(self, remaining):
+        try:
+            block = self.w3.eth.get_block("latest")
+        except Exception:
+            block = None
+        if block is not None and block["number"] != self.block_number:
+            self._on_head(block["number"], block["timestamp"])
+        else:
+            time.sleep(min(self.poll_interval, remaining))
+
+    def _on_head(self, block_number, timestamp):
+        if self.on_head is not None:
+            self.on_head(block_number, timestamp)
+        with self._condition:
+            self.block_number = block_number
+            self._condition.notify_all()
+
+    def _run_subscription(self):
+        try:
+            asyncio.run(self._subscribe())
+        except Exception:
+            pass
+        # falling back to polling
+        with self._condition:
+            self._subscribed = False
+            self._condition.notify_all()
+
+    async def _subscribe(self):
+        async with AsyncWeb3.persistent_websocket(WebsocketProviderV2(self.ws_provider)) as w3:
+            await w3.eth.subscribe("newHeads")
+            async for response in w3.ws.process_subscriptions():
+                head = response["result"]
+                number, timestamp = [int(head[key], 16) if isinstance(head[key], str) else head[key]
+                                     for key in ("number", "timestamp")]
+                self._on_head(number, timestamp)
@@ -0,0 +1,259 @@
+import functools
+import threading
+
+import numpy as np
+import pandas as pd
+
+
+def _locked(method):
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+class PositionLedger:
+    """
+    Positions placed by the bot, stored column by column in preallocated arrays that double when full,
+    and indexed by epoch so appending a bet or updating its result or claim is O(1).
+    A DataFrame is only built by `to_df`, for display and export.
+    The bet status (spent, losses, wins, gain and the loss streak since the last win) is kept up to date
+    as bets are placed and settled, so reading it costs O(1) however long the session runs.
+    The receipt of each bet transaction is recorded once mined (`tx_status` "success" or "reverted",
+    empty while unknown). A reverted bet placed no position, so it is left out of the status and results.
+    Receipts are recorded from the receipt tracker thread, so every public method holds the ledger lock.
+    """
+
+    columns = ["epoch", "position", "amount", "trx_hash", "reward", "claim_hash",
+               "tx_status", "gas_used", "revert_reason"]
+
+    def __init__(self, capacity: int = 64):
+        self._lock = threading.RLock()
+        self._size = 0
+        self._index = {}
+        self._allocate(max(1, capacity))
+
+        # bumped on every change, so views can tell whether they are stale
+        self.version = 0
+        self._reset_status()
+
+    def __len__(self):
+        return self._size
+
+    def __contains__(self, epoch):
+        return epoch in self._index
+
+    @_locked
+    def append(self, epoch, position, amount, trx_hash, reward=0.0, claim_hash="",
+               tx_status="", gas_used=0, revert_reason=""):
+        if self._size == len(self._epoch):
+            self._allocate(2 * len(self._epoch))
+
+        i = self._size
+        self._epoch[i] = epoch
+        self._position[i] = position
+        self._amount[i] = amount
+        self._trx_hash[i] = trx_hash
+        self._reward[i] = reward
+        self._claim_hash[i] = claim_hash
+        self._tx_status[i] = tx_status
+        self._gas_used[i] = gas_used
+        self._revert_reason[i] = revert_reason
+        self._index[epoch] = i
+        self._size += 1
+
+        self.version += 1
+        if tx_status == "reverted":
+            return
+        self._total_spent += amount
+        self._max_spent = max(self._max_spent, amount)
+        if reward != 0:
+            self._add_result(epoch, reward)
+
+    @_locked
+    def get(self, epoch):
+        i = self._index[epoch]
+        return {"epoch": int(self._epoch[i]),
+                "position": self._position[i],
+                "amount": float(self._amount[i]),
+                "trx_hash": self._trx_hash[i],
+                "reward": float(self._reward[i]),
+                "claim_hash": self._claim_hash[i],
+                "tx_status": self._tx_status[i],
+                "gas_used": int(self._gas_used[i]),
+                "revert_reason": self._revert_reason[i]}
+
+    @_locked
+    def set_reward(self, epoch, reward):
+        i = self._index[epoch]
+        previous = self._reward[i]
+        if previous == reward:
+            return
+
+        self._reward[i] = reward
+        self.version += 1
+        if previous == 0:
+            self._add_result(epoch, reward)
+        else:
+            # a result changed after the fact, rare enough to recompute everything
+            self._recompute_status()
+
+    @_locked
+    def set_claim_hash(self, epoch, claim_hash):
+        self._claim_hash[self._index[epoch]] = claim_hash
+        self.version += 1
+
+    @_locked
+    def set_receipt(self, epoch, tx_status, gas_used, revert_reason=""):
+        i = self._index[epoch]
+        previous = self._tx_status[i]
+        self._tx_status[i] = tx_status
+        self._gas_used[i] = gas_used
+        self._revert_reason[i] = revert_reason
+        self.version += 1
+        if (previous == "reverted") != (tx_status == "reverted"):
+            self._recompute_status()
+
+    @_locked
+    def status(self):
+        return {"total_spent": self._total_spent,
+                "max_spent": self._max_spent,
+                "total_loss": self._total_loss,
+                "loss_times": self._loss_times,
+                "estimated_win": self._estimated_win,
+                "win_times": self._win_times,
+                "estimated_gain": self._estimated_win - self._total_loss,
+                "recent_loss": self._recent_loss,
+                "recent_loss_times": self._recent_loss_times}
+
+    @_locked
+    def epochs(self):
+        return self._epoch[:self._size].tolist()
+
+    @_locked
+    def min_epoch(self):
+        return int(self._epoch[:self._size].min()) if self._size > 0 else None
+
+    @_locked
+    def unchecked(self, up_to_epoch):
+        # epochs at or before the given one without a result yet
+        n = self._size
+        mask = (self._epoch[:n] <= up_to_epoch) & (self._reward[:n] == 0) & (self._tx_status[:n] != "reverted")
+        return self._epoch[:n][mask].tolist()
+
+    @_locked
+    def unclaimed(self, up_to_epoch):
+        # epochs at or before the given one, not known as lost and without a claim yet
+        n = self._size
+        mask = (self._epoch[:n] <= up_to_epoch) & (self._reward[:n] >= 0) & (self._claim_hash[:n] == "") \
+            & (self._tx_status[:n] != "reverted")
+        return self._epoch[:n][mask].tolist()
+
+    @_locked
+    def last_result(self, up_to_epoch):
+        # reward of the most recent settled bet at or before the given epoch, None if there is none
+        epochs = self._epoch[:self._size]
+        mask = (epochs <= up_to_epoch) & (self._reward[:self._size] != 0)
+        if not mask.any():
+            return None
+        return float(self._reward[:self._size][mask][np.argmax(epochs[mask])])
+
+    @_locked
+    def to_df(self):
+        n = self._size
+        df = pd.DataFrame({"epoch": self._epoch[:n],
+                           "position": self._position[:n],
+                           "amount": self._amount[:n],
+                           "trx_hash": self._trx_hash[:n],
+                           "reward": self._reward[:n],
+                           "claim_hash": self._claim_hash[:n],
+                           "tx_status": self._tx_status[:n],
+                           "gas_used": self._gas_used[:n],
+                           "revert_reason": self._revert_reason[:n]},
+                          columns=self.columns)
+        df = df.sort_values('epoch', ascending=False)
+        return df.reset_index(drop=True)
+
+    @classmethod
+    def from_df(cls, df):
+        ledger = cls(capacity=max(64, df.shape[0]))
+        df = df.sort_values('epoch')
+        for row in df.to_dict("records"):
+            # files exported before a column existed, and empty cells read back as NaN
+            text = {name: row.get(name) if isinstance(row.get(name), str) else ""
+                    for name in ["claim_hash", "tx_status", "revert_reason"]}
+            gas_used = row.get("gas_used", 0)
+            ledger.append(int(row["epoch"]), row["position"], float(row["amount"]), row["trx_hash"],
+                          reward=float(row["reward"]), claim_hash=text["claim_hash"],
+                          tx_status=text["tx_status"], gas_used=0 if pd.isna(gas_used) else int(gas_used),
+                          revert_reason=text["revert_reason"])
+        return ledger
+
+    # ---------------
+    # PRIVATE METHODS
+    # ---------------
+
+    def _reset_status(self):
+        self._total_spent = 0.0
+        self._max_spent = 0.0
+        self._total_loss = 0.0
+        self._loss_times = 0
+        self._estimated_win = 0.0
+        self._win_times = 0
+        # losses after the most recent winning epoch
+        self._recent_loss = 0.0
+        self._recent_loss_times = 0
+        self._last_win_epoch = None
+        self._last_settled_epoch = None
+
+    def _add_result(self, epoch, reward):
+        if reward < 0:
+            self._total_loss -= reward
+            self._loss_times += 1
+            if self._last_win_epoch is None or epoch > self._last_win_epoch:
+                self._recent_loss -= reward
+                self._recent_loss_times += 1
+        elif reward > 0:
+            self._estimated_win += reward
+            self._win_times += 1
+            if self._last_win_epoch is None or epoch > self._last_win_epoch:
+                self._last_win_epoch = epoch
+                if self._last_settled_epoch is not None and epoch < self._last_settled_epoch:
+                    # settled out of order, later losses are still recent
+                    self._recount_recent_loss()
+                else:
+                    self._recent_loss = 0.0
+                    self._recent_loss_times = 0
+
+        if self._last_settled_epoch is None or epoch > self._last_settled_epoch:
+            self._last_settled_epoch = epoch
+
+    def _recount_recent_loss(self):
+        epochs = self._epoch[:self._size]
+        rewards = self._reward[:self._size]
+        mask = (epochs > self._last_win_epoch) & (rewards < 0)
+        self._recent_loss = float(-rewards[mask].sum())
+        self._recent_loss_times = int(mask.sum())
+
+    def _recompute_status(self):
+        self._reset_status()
+        order = np.argsort(self._epoch[:self._size], kind="stable")
+        for i in order:
+            if self._tx_status[i] == "reverted":
+                continue
+            self._total_spent += self._amount[i]
+            self._max_spent = max(self._max_spent, self._amount[i])
+            if self._reward[i] != 0:
+                self._add_result(int(self._epoch[i]), float(self._reward[i]))
+
+    def _allocate(self, capacity):
+        # new arrays of the given capacity, keeping the current rows
+        n = self._size
+        for name, dtype in [("_epoch", np.int64), ("_amount", np.float64), ("_reward", np.float64),
+                            ("_gas_used", np.int64), ("_position", object), ("_trx_hash", object),
+                            ("_claim_hash", object), ("_tx_status", object), ("_revert_reason", object)]:
+            array = np.zeros(capacity, dtype=dtype) if dtype is not object else np.full(capacity, "", dtype=object)
+            if n > 0:
+                array[:n] = getattr(self, name)[:n]
+            setattr(self, name, array)
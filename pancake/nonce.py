@@ -0,0 +1,63 @@
+import threading
+
+
+class NonceManager:
+    """
+    Hands out transaction nonces per address without asking the node each time.
+    The first transaction of an address syncs its pending transaction count, later ones increment it locally.
+    A failed submission drops the local count, so the next one syncs again, and a nonce the node
+    rejects as already used is retried once with a fresh count.
+    Thread-safe, bets and claims may be submitted concurrently.
+    """
+
+    RETRY_ERRORS = ("nonce too low", "replacement transaction underpriced")
+
+    def __init__(self, get_transaction_count):
+        self.get_transaction_count = get_transaction_count
+        self._nonces = {}
+        self._lock = threading.Lock()
+
+    # ---------------
+    # PUBLIC METHODS
+    # ---------------
+
+    def next(self, address):
+        """Reserves the next nonce of the address."""
+        with self._lock:
+            nonce = self._nonces.get(address)
+            if nonce is None:
+                nonce = self.get_transaction_count(address)
+            self._nonces[address] = nonce + 1
+            return nonce
+
+    def peek(self, address):
+        """The nonce the next reservation returns, without reserving it."""
+        with self._lock:
+            if address not in self._nonces:
+                self._nonces[address] = self.get_transaction_count(address)
+            return self._nonces[address]
+
+    def commit(self, address, nonce):
+        """Reserves the given nonce if it is the next one of the address (e.g. a transaction signed
+        after `peek`). Returns False, reserving nothing, if it is not."""
+        with self._lock:
+            if self._nonces.get(address) != nonce:
+                return False
+            self._nonces[address] = nonce + 1
+            return True
+
+    def reset(self, address):
+        with self._lock:
+            self._nonces.pop(address, None)
+
+    def send(self, address, submit):
+        """Calls `submit(nonce)` with a reserved nonce and returns its result."""
+        for attempt in range(2):
+            nonce = self.next(address)
+            try:
+                return submit(nonce)
+            except Exception as exc:
+                self.reset(address)
+                if attempt == 0 and any(error in str(exc).lower() for error in self.RETRY_ERRORS):
+                    continue
+                raise
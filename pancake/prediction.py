@@ -2,13 +2,26 @@ import requests
 from retrying import retry
 from web3 import Web3
 from web3.middleware import geth_poa_middleware
+import copy
 import datetime as dt
-import pandas as pd
-import numpy as np
-
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from pancake.claims import ClaimPipeline
+from pancake.clock import RoundClock
+from pancake.coalesce import BlockCache
+from pancake.ledger import PositionLedger
+from pancake.nonce import NonceManager
+from pancake.presign import BetPreparer
+from pancake.receipts import ReceiptTracker
 from utils.abi import get_abi
 from utils.config import config
-from utils.round import round_columns
+from utils.lru import LRUCache
+from utils.multicall import Multicall
+from utils.provider import ProviderPool, get_providers
+from utils.round import RoundArray, get_round_stats, transform_round_data
+from utils.store import RoundStore
 
 
 def retry_on_http_error(exc):
@@ -16,23 +29,44 @@ def retry_on_http_error(exc):
 
 
 class Prediction:
-    def __init__(self, address: str = None, private_key: str = None):
+    def __init__(self, address: str = None, private_key: str = None, lazy: bool = None, offline: bool = False):
         self.smart_contract = config["general"]["smart_contract"]
         self.web3_provider = config["general"]["web3_provider"]
+        self.web3_providers = get_providers()
         self.abi_api = config["general"]["abi_api"]
         self.debug = config["experimental"]["debug"]
 
-        # initializing web3 object
-        self.w3 = None
-        self._init_w3()
+        # initializing web3 object, contract ABI, prediction object and batched contract reads,
+        # in the background in lazy mode so the caller can render while they are built
+        self._w3 = None
+        self._contract_abi = None
+        self._prediction_contract = ""
+        self._multicall = None
+        self._chain_id = None
+        self._bootstrap_error = None
+        self._ready = threading.Event()
+        self._bootstrap_lock = threading.Lock()
+
+        if lazy is None:
+            lazy = config["experimental"]["lazy_start"]
+        if offline:
+            # no client at all, for stand-ins serving rounds from elsewhere (e.g. the backtest simulator)
+            self._ready.set()
+        elif lazy:
+            threading.Thread(target=self._bootstrap, daemon=True).start()
+        else:
+            self._bootstrap()
+            self._wait_ready()
 
-        # initializing contract ABI
-        self.contract_abi = None
-        self._get_abi()
+        # initializing local round store, and its in-memory tier for settled rounds (none offline, nothing
+        # is read from the chain to store)
+        self.round_store = None if offline else RoundStore()
+        self.round_cache = LRUCache(config["cache"]["rounds"])
 
-        # initializing prediction object
-        self.prediction_contract = ""
-        self._init_abi()
+        # initializing block-scoped cache of mutable contract reads, and the threads reading them concurrently
+        # (none offline, where the reads are local and prefetching runs them in turn)
+        self.block_cache = BlockCache(lambda: self.w3.eth.block_number, config["coalesce"]["block_ttl"])
+        self._reader = None if offline else ThreadPoolExecutor(max_workers=config["coalesce"]["read_workers"])
 
         # initializing wallet
         self.address = address
@@ -47,9 +81,60 @@ class Prediction:
 
         self.gas = config["tx"]["gas"]
         self.gas_price = config["tx"]["gas_price"]
+        self.wait_for_receipt = config["tx"]["wait_for_receipt"]
+
+        self.ledger = PositionLedger()
+        self.nonce_manager = NonceManager(lambda address: self.w3.eth.get_transaction_count(address, "pending"))
+        self.clock = RoundClock()
+        self.receipt_tracker = ReceiptTracker(self)
+        self.claim_pipeline = ClaimPipeline(self)
+        self.bet_preparer = BetPreparer(self)
+
+    # ---------------
+    # CONTRACT CLIENT
+    # ---------------
+
+    @property
+    def w3(self):
+        self._wait_ready()
+        return self._w3
+
+    @w3.setter
+    def w3(self, w3):
+        self._w3 = w3
+
+    @property
+    def contract_abi(self):
+        self._wait_ready()
+        return self._contract_abi
+
+    @contract_abi.setter
+    def contract_abi(self, contract_abi):
+        self._contract_abi = contract_abi
+
+    @property
+    def prediction_contract(self):
+        self._wait_ready()
+        return self._prediction_contract
+
+    @prediction_contract.setter
+    def prediction_contract(self, prediction_contract):
+        self._prediction_contract = prediction_contract
+
+    @property
+    def multicall(self):
+        self._wait_ready()
+        return self._multicall
+
+    @multicall.setter
+    def multicall(self, multicall):
+        self._multicall = multicall
+
+    @property
+    def chain_id(self):
+        self._wait_ready()
+        return self._chain_id
 
-        self.running_columns = ["epoch", "position", "amount", "trx_hash", "reward", "claim_hash"]
-        self.df_running = pd.DataFrame(columns=self.running_columns)
     # ---------------
     # PUBLIC METHODS
     # ---------------
@@ -61,19 +146,38 @@ class Prediction:
     def set_private_key(self, private_key):
         self.private_key = private_key
 
+    def fork(self, address: str = None, private_key: str = None):
+        """
+        Another wallet on this client. The connection, contract, caches, round store, clock, nonces and
+        receipt tracker are shared, so any number of forks read the chain as often as a single one.
+        The positions, prepared bets and claims are the fork's own.
+        """
+        self._wait_ready()
+        fork = copy.copy(self)
+        fork.address = address
+        fork.private_key = private_key
+        fork.ledger = PositionLedger()
+        fork.bet_preparer = BetPreparer(fork)
+        fork.claim_pipeline = ClaimPipeline(fork)
+        return fork
+
+    def set_block_number(self, block_number, timestamp=None):
+        # pushed by a block watcher, saves a block number read per block
+        self.block_cache.set_block_number(block_number)
+        if timestamp is not None:
+            self.clock.observe_block(timestamp)
+
     def set_df_running(self, df):
-        self.df_running = df.copy()
+        self.ledger = PositionLedger.from_df(df)
 
     # IsPaused?
     def is_paused(self):
-        paused = self.prediction_contract.functions.paused().call()
+        paused = self.block_cache.get(("paused",), self.prediction_contract.functions.paused().call)
         return paused
 
     # Running History Dataframe
     def get_running_df(self):
-        self.df_running = self.df_running.sort_values('epoch', ascending=False)
-        self.df_running = self.df_running.reset_index(drop=True)
-        return self.df_running
+        return self.ledger.to_df()
 
     # Wallet Functions
     @retry(retry_on_exception=retry_on_http_error,
@@ -81,7 +185,8 @@ class Prediction:
            wait_fixed=config["retry"]["delay"])
     def get_balance(self):
         try:
-            my_balance = self.w3.eth.get_balance(self.address)
+            my_balance = self.block_cache.get(("balance", self.address),
+                                              lambda: self.w3.eth.get_balance(self.address))
             my_balance = self.w3.from_wei(my_balance, 'ether')
         except:
             my_balance = None
@@ -103,114 +208,135 @@ class Prediction:
            stop_max_attempt_number=config["retry"]["max_try"],
            wait_fixed=config["retry"]["delay"])
     def get_round(self, epoch):
-        data = self.prediction_contract.functions.rounds(epoch).call()
-        data = self._transform_round_data(data)
+        if self.current_epoch > 0 and epoch >= self.current_epoch - 1:
+            # the current and previous rounds are live, they change with every bet or oracle call,
+            # so they skip the memory and local store tiers and are only reused within the same block
+            return self._get_live_round(epoch)
+
+        # final rounds never change, so they are served from memory or the local store
+        data = self.round_cache.get(epoch)
+        if data is not None:
+            return data
+
+        data = self.round_store.get(epoch)
+        if data is None:
+            data = self._get_live_round(epoch)
+            self.round_store.save(data)
+
+        if self.round_store.is_final(data):
+            self.round_cache.put(epoch, data)
         return data
 
+    def get_rounds(self, epochs):
+        # bulk version of get_round, only the epochs missing from the local store are fetched
+        epochs = list(epochs)
+        cached = {}
+        for epoch in epochs:
+            data = self.round_cache.get(epoch)
+            if data is not None:
+                cached[epoch] = data
+
+        stored = self.round_store.get_many([epoch for epoch in epochs if epoch not in cached])
+        for epoch, data in stored.items():
+            self.round_cache.put(epoch, data)
+        cached.update(stored)
+
+        missing = [epoch for epoch in epochs if epoch not in cached]
+        if len(missing) > 0:
+            fetched = self.multicall.call([self.prediction_contract.functions.rounds(epoch) for epoch in missing])
+            fetched = [transform_round_data(data) for data in fetched]
+            self.round_store.save_many(fetched)
+            for epoch, data in zip(missing, fetched):
+                if self.round_store.is_final(data):
+                    self.round_cache.put(epoch, data)
+                cached[epoch] = data
+
+        return RoundArray(cached[epoch] for epoch in epochs)
+
+    def get_history(self, current_epoch, back_in_time=100):
+        # settled rounds before the current epoch, the most recent first
+        start_epoch_history = current_epoch - 2 - back_in_time
+        rounds = self.get_rounds(range(start_epoch_history, current_epoch - 1))
+        return rounds.sort(ascending=False)
+
+    def get_cache_stats(self):
+        return {"rounds": self.round_cache.stats(),
+                "block": {"hits": self.block_cache.hits, "misses": self.block_cache.misses}}
+
     def get_round_stats(self, epoch):
-        df_round = self.get_round(epoch)
-
-        total_amount = (df_round["bullAmount"] + df_round["bearAmount"]).iloc[0]
-        if total_amount > 0:
-            bull_ratio = ((df_round["bullAmount"] / total_amount) * 100).iloc[0]
-            bear_ratio = ((df_round["bearAmount"] / total_amount) * 100).iloc[0]
-            bear_pay_ratio = (total_amount / df_round["bearAmount"]).iloc[0]
-            bull_pay_ratio = (total_amount / df_round["bullAmount"]).iloc[0]
-        else:
-            bull_ratio = None
-            bear_ratio = None
-            bear_pay_ratio = None
-            bull_pay_ratio = None
-
-        round_start_time = dt.datetime.fromtimestamp(df_round["startTimestamp"].iloc[0])
-        round_bet_time = dt.datetime.fromtimestamp(df_round["lockTimestamp"].iloc[0]) - dt.timedelta(seconds=config["bet"]["seconds_left"])
-        round_lock_time = dt.datetime.fromtimestamp(df_round["lockTimestamp"].iloc[0])
-        round_close_time = dt.datetime.fromtimestamp(df_round["closeTimestamp"].iloc[0])
-
-        return {"total_amount": total_amount,
-                "bull_ratio": bull_ratio, "bear_ratio": bear_ratio,
-                "bear_pay_ratio": bear_pay_ratio, "bull_pay_ratio": bull_pay_ratio,
-                "round_start_time": round_start_time,
-                "round_bet_time": round_bet_time,
-                "round_lock_time": round_lock_time,
-                "round_close_time": round_close_time}
+        return get_round_stats(self.get_round(epoch))
+
+    def prefetch(self, epoch, back_in_time=0):
+        """
+        Reads the round, the pause flag and the balance of the epoch, and the history before it, concurrently
+        through the provider pool. They land in the block cache and the round cache, so the reads of the tick
+        that follow are served from memory instead of running back to back.
+        """
+        reads = [lambda: self.get_round(epoch), self.is_paused]
+        if self.address:
+            reads.append(self.get_balance)
+        if back_in_time > 0:
+            reads.append(lambda: self.get_history(epoch, back_in_time=back_in_time))
+        if self._reader is None:
+            for read in reads:
+                read()
+            return
+        for future in [self._reader.submit(read) for read in reads]:
+            future.result()
 
     @retry(retry_on_exception=retry_on_http_error,
            stop_max_attempt_number=config["retry"]["max_try"],
            wait_fixed=config["retry"]["delay"])
     def get_current_epoch(self):
-        current_epoch = self.prediction_contract.functions.currentEpoch().call()
+        current_epoch = self.block_cache.get(("currentEpoch",),
+                                             self.prediction_contract.functions.currentEpoch().call)
         if self.current_epoch != current_epoch:
             self.current_epoch = current_epoch
-            self.start_time = dt.datetime.now()
-            self.lock_time = self.start_time + dt.timedelta(minutes=5)
-            self.bet_time = self.lock_time - dt.timedelta(seconds=config["bet"]["seconds_left_at_estimated_time"])
-            self.close_time = self.lock_time + dt.timedelta(minutes=5)
+            self._update_round_times(current_epoch)
         return current_epoch
 
     # Bet Functions
     def bet_bull(self, value):
-        epoch = self.get_current_epoch()
-        if self.debug:
-            trx_hash = "trx_hash_sample_string"
-        else:
-            value = self.w3.to_wei(value, 'ether')
-            bull_bet = self.prediction_contract.functions.betBull(epoch).buildTransaction({
-                'from': self.address,
-                'nonce': self.w3.eth.getTransactionCount(self.address),
-                'value': value,
-                'gas': self.gas,
-                'gasPrice': self.gas_price,
-            })
-            signed_trx = self.w3.eth.account.sign_transaction(bull_bet, private_key=self.private_key)
-            self.w3.eth.send_raw_transaction(signed_trx.rawTransaction)
-            trx_hash = f'{self.w3.eth.wait_for_transaction_receipt(signed_trx.hash)}'
-            value = self.w3.from_wei(value, 'ether')
-
-        self._update_running_df_bet(epoch, "bull", value, trx_hash)
-        return trx_hash
+        return self._bet("bull", "betBull", value)
 
     def bet_bear(self, value):
-        epoch = self.get_current_epoch()
+        return self._bet("bear", "betBear", value)
+
+    def prepare_bets(self, epoch, values):
+        """Signs the bull and bear bets of the epoch at the given stakes (by position) ahead of the decision,
+        so placing either one at the deadline only broadcasts it."""
         if self.debug:
-            trx_hash = "trx_hash_sample_string"
-        else:
-            value = self.w3.toWei(value, 'ether')
-            bear_bet = self.prediction_contract.functions.betBear(epoch).buildTransaction({
-                'from': self.address,
-                'nonce': self.w3.eth.get_transaction_count(self.address),
-                'value': value,
-                'gas': self.gas,
-                'gasPrice': self.gas_price,
-            })
-            signed_trx = self.w3.eth.account.sign_transaction(bear_bet, private_key=self.private_key)
-            self.w3.eth.send_raw_transaction(signed_trx.raw_transaction)
-            trx_hash = f'{self.w3.eth.wait_for_transaction_receipt(signed_trx.hash)}'
-            value = self.w3.from_wei(value, 'ether')
-
-        self._update_running_df_bet(epoch, "bear", value, trx_hash)
-        return trx_hash
+            return
+        self.bet_preparer.prepare(epoch, {position: self.w3.to_wei(value, 'ether')
+                                          for position, value in values.items()})
+
+    def sign_transaction(self, function, nonce, value=0, gas=None, gas_price=None):
+        """Builds and signs a call of the bound contract function. `value` is in wei."""
+        trx = function.build_transaction({
+            'from': self.address,
+            'nonce': nonce,
+            'value': value,
+            'gas': self.gas if gas is None else gas,
+            'gasPrice': self.gas_price if gas_price is None else gas_price,
+            'chainId': self.chain_id,
+        })
+        return self.w3.eth.account.sign_transaction(trx, private_key=self.private_key)
+
+    def send_transaction(self, function, value=0, gas=None, gas_price=None):
+        """Builds, signs and sends a call of the bound contract function with a locally managed nonce.
+        `value` is in wei. Returns the transaction hash."""
+        def submit(nonce):
+            signed_trx = self.sign_transaction(function, nonce, value=value, gas=gas, gas_price=gas_price)
+            return self.w3.eth.send_raw_transaction(signed_trx.rawTransaction)
+
+        return self.w3.to_hex(self.nonce_manager.send(self.address, submit))
 
     # Claim Functions
     def claim(self, epochs):
-        if self.debug:
-            claim_hash = "trx_claim_hash_sample_string"
-        else:
-            claim = self.prediction_contract.functions.claim(epochs).buildTransaction({
-                'from': self.address,
-                'nonce': self.w3.eth.get_transaction_count(self.address),
-                'value': 0,
-                'gas': 800000,
-                'gasPrice': 5000000000,
-            })
-            signed_trx = self.w3.eth.account.sign_transaction(claim, private_key=self.private_key)
-            self.w3.eth.send_raw_transaction(signed_trx.raw_transaction)
-            claim_hash = f'{self.w3.eth.wait_for_transaction_receipt(signed_trx.hash)}'
-
-        for epoch in epochs:
-            self._update_running_df_claim(epoch, claim_hash)
-
-        return claim_hash
+        # epochs known claimable (e.g. from fetch_claimable), one transaction per chunk of them,
+        # their receipts are awaited in the background
+        chunks = self.claim_pipeline.submit(epochs, checked=True)
+        return ", ".join(dict.fromkeys(chunk.tx_hash for chunk in chunks))
 
     @retry(retry_on_exception=retry_on_http_error,
            stop_max_attempt_number=config["retry"]["max_try"],
@@ -235,17 +361,44 @@ class Prediction:
            stop_max_attempt_number=config["retry"]["max_try"],
            wait_fixed=config["retry"]["delay"])
     def fetch_claimable(self):
-        epochs = []
-        current = self.prediction_contract.functions.currentEpoch().call()
-        epoch = current - 2
-        stop = self.df_running["epoch"].min()
-
-        while epoch >= stop:
-            claimable = self.claimable(self, epoch)
-            if claimable:
-                epochs.append(epoch)
-            epoch -= 1
-        return epochs
+        # only bets of settled epochs that are neither known losses nor claimed yet are checked, in one batch
+        current = self.get_current_epoch()
+        epochs = self.ledger.unclaimed(current - 2)
+        if len(epochs) == 0:
+            return []
+
+        if self.debug:
+            results = [(self._check_epoch_result(epoch), False) for epoch in epochs]
+        else:
+            calls = []
+            for epoch in epochs:
+                calls.append(self.prediction_contract.functions.claimable(epoch, self.address))
+                calls.append(self.prediction_contract.functions.ledger(epoch, self.address))
+            responses = self.multicall.call(calls)
+            # ledger returns (position, amount, claimed)
+            results = [(responses[i], responses[i + 1][2]) for i in range(0, len(responses), 2)]
+
+        claimable_epochs = []
+        for epoch, (claimable, claimed) in zip(epochs, results):
+            if claimed:
+                # won and already claimed outside this session
+                self._update_running_df_status(epoch, 1)
+                self._update_running_df_claim(epoch, "claimed")
+            elif claimable:
+                self._update_running_df_status(epoch, 1)
+                claimable_epochs.append(epoch)
+            else:
+                self._update_running_df_status(epoch, 0)
+        return claimable_epochs
+
+    def get_claimable(self, epochs):
+        """The given epochs the wallet can claim, checked in one batch."""
+        epochs = list(epochs)
+        if len(epochs) == 0:
+            return []
+        results = self.multicall.call([self.prediction_contract.functions.claimable(epoch, self.address)
+                                       for epoch in epochs])
+        return [epoch for epoch, claimable in zip(epochs, results) if claimable]
 
     def handle_claim(self):
         trx_hash = None
@@ -258,18 +411,47 @@ class Prediction:
     # PRIVATE METHODS
     # ---------------
 
+    def _bootstrap(self):
+        try:
+            self._init_w3()
+            # fetched once, so signing a transaction needs no eth_chainId round trip
+            self._chain_id = self._w3.eth.chain_id
+            self._get_abi()
+            self._init_abi()
+            self._multicall = Multicall(self._w3)
+        except Exception as exc:
+            self._bootstrap_error = exc
+        finally:
+            self._ready.set()
+
+    def _wait_ready(self):
+        # a failed bootstrap is reported once and started again, so the next access waits for a new attempt
+        while True:
+            self._ready.wait()
+            with self._bootstrap_lock:
+                if not self._ready.is_set():
+                    # another caller started a new attempt meanwhile
+                    continue
+                error = self._bootstrap_error
+                if error is None:
+                    return
+                self._bootstrap_error = None
+                self._ready.clear()
+                threading.Thread(target=self._bootstrap, daemon=True).start()
+            raise error
+
     @retry(retry_on_exception=retry_on_http_error,
            stop_max_attempt_number=config["retry"]["max_try"],
            wait_fixed=config["retry"]["delay"])
     def _init_w3(self):
-        # BSC NODE
-        self.w3 = Web3(Web3.HTTPProvider(self.web3_provider))
-        self.w3.middleware_onion.inject(geth_poa_middleware, layer=0)
+        # BSC NODES
+        self._w3 = Web3(ProviderPool(self.web3_providers))
+        self._w3.middleware_onion.inject(geth_poa_middleware, layer=0)
 
     def _init_abi(self):
         # V2 CONTRACT
-        self.prediction_contract = self.w3.eth.contract(address=self.smart_contract,
-                                                        abi=self.contract_abi)
+        self._prediction_contract = self._w3.eth.contract(address=self.smart_contract,
+                                                          abi=self._contract_abi)
 
     @retry(retry_on_exception=retry_on_http_error,
            stop_max_attempt_number=config["retry"]["max_try"],
@@ -281,52 +463,73 @@ class Prediction:
         # r = requests.get(url=API_ENDPOINT)
         # response = r.json()
         # self.contract_abi = json.loads(response["result"])
-        self.contract_abi = get_abi()
-
-    def _transform_round_data(self, data):
-        # uint256 epoch;
-        # uint256 startTimestamp;
-        # uint256 lockTimestamp;
-        # uint256 closeTimestamp;
-
-        # int256 lockPrice;
-        data[4] = data[4] / 100000000
-        # int256 closePrice;
-        data[5] = data[5] / 100000000
-        # uint256 lockOracleId;
-        data[6] = 0
-        # uint256 closeOracleId;
-        data[7] = 0
-        # uint256 totalAmount;
-        data[8] = self.w3.from_wei(data[8], 'ether')
-        # uint256 bullAmount;
-        data[9] = self.w3.from_wei(data[9], 'ether')
-        # uint256 bearAmount;
-        data[10] = self.w3.from_wei(data[10], 'ether')
-        # uint256 rewardBaseCalAmount;
-        data[11] = self.w3.from_wei(data[11], 'ether')
-        # uint256 rewardAmount;
-        data[12] = self.w3.from_wei(data[12], 'ether')
-        # bool oracleCalled;
-
-        df_current_round = pd.DataFrame(np.array([data]),
-                                        columns=round_columns)
-        df_current_round = df_current_round.apply(pd.to_numeric, downcast='float')
-
-        return df_current_round
+        self._contract_abi = get_abi()
+
+    def _bet(self, position, function_name, value):
+        epoch = self.get_current_epoch()
+        if self.debug:
+            trx_hash = "trx_hash_sample_string"
+        else:
+            value_wei = self.w3.to_wei(value, 'ether')
+            trx_hash = None
+            sent_at = time.time()
+            prepared = self.bet_preparer.take(epoch, position, value_wei)
+            if prepared is not None:
+                try:
+                    trx_hash = self.w3.to_hex(self.w3.eth.send_raw_transaction(prepared.raw_transaction))
+                except Exception:
+                    # e.g. the nonce was used meanwhile, the contract rejects a second bet on the epoch anyway
+                    self.nonce_manager.reset(self.address)
+            if trx_hash is None:
+                function = getattr(self.prediction_contract.functions, function_name)(epoch)
+                trx_hash = self.send_transaction(function, value=value_wei)
+
+        self._update_running_df_bet(epoch, position, value, trx_hash)
+
+        if not self.debug:
+            def on_receipt(receipt):
+                self._update_running_df_receipt(epoch, receipt)
+                self.clock.observe_inclusion(sent_at, self.w3.eth.get_block(receipt["blockNumber"])["timestamp"])
+
+            if self.wait_for_receipt:
+                on_receipt(self.w3.eth.wait_for_transaction_receipt(trx_hash))
+            else:
+                self.receipt_tracker.track(trx_hash, on_receipt)
+        return trx_hash
+
+    def _get_live_round(self, epoch):
+        return self.block_cache.get(("rounds", epoch),
+                                    lambda: transform_round_data(self.prediction_contract.functions.rounds(epoch).call()))
+
+    def _update_round_times(self, epoch):
+        # chain timestamps of the round, on the local clock
+        # cached per block, so forks noticing the new epoch together read the rounds once
+        previous, current = self.block_cache.get(("roundTimes", epoch), lambda: self.get_rounds([epoch - 1, epoch]))
+        self.clock.observe_lock(previous.lockTimestamp, current.startTimestamp)
+
+        interval = current.lockTimestamp - current.startTimestamp
+        self.start_time = self.clock.to_datetime(current.startTimestamp)
+        self.lock_time = self.clock.to_datetime(current.lockTimestamp)
+        self.bet_time = dt.datetime.fromtimestamp(self.clock.fire_at(current.lockTimestamp))
+        self.close_time = self.clock.to_datetime(current.lockTimestamp + self.clock.lock_delay + interval)
 
     def _update_running_df_bet(self, epoch, position, amount, trx_hash):
-        # self.running_columns = ["epoch", "position", "amount", "trx_hash", "reward", "claim_hash"]
-        data = [epoch, position, amount, trx_hash, 0, ""]
-        temp = pd.DataFrame(data=[data], columns=self.running_columns)
-        self.df_running = self.df_running.append(temp)
+        self.ledger.append(epoch, position, amount, trx_hash)
+
+    def _update_running_df_receipt(self, epoch, receipt):
+        if receipt["status"] == 1:
+            self.ledger.set_receipt(epoch, "success", receipt["gasUsed"])
+        else:
+            self.ledger.set_receipt(epoch, "reverted", receipt["gasUsed"],
+                                    self.receipt_tracker.revert_reason(receipt))
 
     def _update_running_df_status(self, epoch, result):
-        bet_value = self.df_running[self.df_running.epoch == epoch]["amount"].iloc[0]
-        bet_position = self.df_running[self.df_running.epoch == epoch]["position"].iloc[0]
+        bet = self.ledger.get(epoch)
+        bet_value = bet["amount"]
+        bet_position = bet["position"]
         if result == 0:
             # loss
-            self.df_running.loc[self.df_running.epoch == epoch, "reward"] = -1 * bet_value
+            self.ledger.set_reward(epoch, -1 * bet_value)
         elif result == 1:
             # win
             epoch_stats = self.get_round_stats(epoch)
@@ -335,15 +538,15 @@ class Prediction:
             elif bet_position == "bear":
                 pay_ratio = epoch_stats["bear_pay_ratio"]
 
-            self.df_running.loc[self.df_running.epoch == epoch, "reward"] = (bet_value * pay_ratio) - bet_value
+            self.ledger.set_reward(epoch, (bet_value * pay_ratio) - bet_value)
 
     def _update_running_df_claim(self, epoch, claim_hash):
-        self.df_running.loc[self.df_running.epoch == epoch, "claim_hash"] = claim_hash
+        self.ledger.set_claim_hash(epoch, claim_hash)
 
     def _check_epoch_result(self, epoch):
         data = self.get_round(epoch)
-        lock_price = data["lockPrice"].iloc[0]
-        close_price = data["closePrice"].iloc[0]
+        lock_price = data.lockPrice
+        close_price = data.closePrice
 
         if lock_price > close_price:
             # bearish
@@ -355,7 +558,7 @@ class Prediction:
             # draw
             condition = 0
 
-        bet_position = self.df_running[self.df_running["epoch"] == epoch]["position"].iloc[0]
+        bet_position = self.ledger.get(epoch)["position"]
         if (bet_position == "bull") and (condition == 1):
             return 1
         elif (bet_position == "bear") and (condition == -1):
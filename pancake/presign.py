@@ -0,0 +1,76 @@
+import threading
+
+
+class PreparedBet:
+    """A signed bet transaction waiting to be broadcast."""
+
+    __slots__ = ("address", "epoch", "position", "value", "nonce", "raw_transaction")
+
+    def __init__(self, address, epoch, position, value, nonce, raw_transaction):
+        self.address = address
+        self.epoch = epoch
+        self.position = position
+        self.value = value
+        self.nonce = nonce
+        self.raw_transaction = raw_transaction
+
+
+class BetPreparer:
+    """
+    Keeps the bull and bear bets of the current epoch built and signed ahead of the decision,
+    so placing a bet at the deadline only broadcasts it.
+    Both bets are signed with the nonce the next transaction would get, each at its own stake, and
+    a bet is signed again whenever the epoch, its stake (in wei), the wallet or that nonce changes.
+    """
+
+    FUNCTIONS = {"bull": "betBull", "bear": "betBear"}
+
+    def __init__(self, psp):
+        self.psp = psp
+        self._prepared = {}
+        self._lock = threading.Lock()
+
+    # ---------------
+    # PUBLIC METHODS
+    # ---------------
+
+    def prepare(self, epoch, values):
+        address = self.psp.address
+        nonce = self.psp.nonce_manager.peek(address)
+        with self._lock:
+            for position, function_name in self.FUNCTIONS.items():
+                value = values[position]
+                prepared = self._prepared.get(position)
+                if prepared is not None and (prepared.address, prepared.epoch, prepared.value, prepared.nonce) \
+                        == (address, epoch, value, nonce):
+                    continue
+                self._prepared[position] = self._sign(address, epoch, position, function_name, value, nonce)
+
+    def take(self, epoch, position, value):
+        """
+        Returns the prepared bet matching the arguments and reserves its nonce, or None when there is
+        no such bet or its nonce is no longer the next one. Either way, nothing prepared is left,
+        as both sides shared that nonce.
+        """
+        with self._lock:
+            prepared = self._prepared.get(position)
+            self._prepared.clear()
+
+        if prepared is None or (prepared.address, prepared.epoch, prepared.value) != (self.psp.address, epoch, value):
+            return None
+        if not self.psp.nonce_manager.commit(prepared.address, prepared.nonce):
+            return None
+        return prepared
+
+    def clear(self):
+        with self._lock:
+            self._prepared.clear()
+
+    # ---------------
+    # PRIVATE METHODS
+    # ---------------
+
+    def _sign(self, address, epoch, position, function_name, value, nonce):
+        function = getattr(self.psp.prediction_contract.functions, function_name)(epoch)
+        signed_trx = self.psp.sign_transaction(function, nonce, value=value)
+        return PreparedBet(address, epoch, position, value, nonce, signed_trx.rawTransaction)
@@ -0,0 +1,98 @@
+import logging
+import threading
+import time
+from concurrent.futures import Future
+
+from web3.exceptions import TimeExhausted, TransactionNotFound
+
+from utils.config import config
+
+logger = logging.getLogger(__name__)
+
+
+class ReceiptTracker:
+    """
+    Awaits transaction receipts in one background thread, so sending a transaction never blocks the caller.
+    Pending transactions are polled every [tx] receipt_poll_interval seconds until mined, or until
+    [tx] receipt_timeout seconds have passed. Each tracked transaction gets a future resolving to its
+    receipt, and an optional callback called with the receipt from the tracker thread.
+    """
+
+    def __init__(self, psp, poll_interval: float = None, timeout: float = None):
+        self.psp = psp
+        self.poll_interval = config["tx"]["receipt_poll_interval"] if poll_interval is None else poll_interval
+        self.timeout = config["tx"]["receipt_timeout"] if timeout is None else timeout
+
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    # ---------------
+    # PUBLIC METHODS
+    # ---------------
+
+    def track(self, tx_hash, on_receipt=None):
+        future = Future()
+        with self._lock:
+            self._pending[tx_hash] = (future, on_receipt, time.monotonic() + self.timeout)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+        return future
+
+    def pending(self):
+        with self._lock:
+            return list(self._pending)
+
+    def revert_reason(self, receipt):
+        """Replays a reverted transaction on the state before its block to read the revert message."""
+        w3 = self.psp.w3
+        trx = w3.eth.get_transaction(receipt["transactionHash"])
+        try:
+            w3.eth.call({"from": trx["from"], "to": trx["to"], "data": trx["input"],
+                         "value": trx["value"], "gas": trx["gas"]},
+                        receipt["blockNumber"] - 1)
+        except Exception as exc:
+            return str(exc)
+        # the replay went through, so the gas limit was what fell short
+        return "out of gas" if receipt["gasUsed"] >= trx["gas"] else ""
+
+    # ---------------
+    # PRIVATE METHODS
+    # ---------------
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if len(self._pending) == 0:
+                    self._thread = None
+                    return
+                pending = list(self._pending.items())
+
+            for tx_hash, (future, on_receipt, deadline) in pending:
+                try:
+                    receipt = self.psp.w3.eth.get_transaction_receipt(tx_hash)
+                except TransactionNotFound:
+                    receipt = None
+                except Exception:
+                    # node errors are retried on the next poll
+                    receipt = None
+
+                if receipt is None and time.monotonic() < deadline:
+                    continue
+
+                with self._lock:
+                    self._pending.pop(tx_hash, None)
+                if receipt is None:
+                    future.set_exception(TimeExhausted(f"Transaction {tx_hash} is not mined "
+                                                       f"after {self.timeout} seconds"))
+                    continue
+
+                if on_receipt is not None:
+                    try:
+                        on_receipt(receipt)
+                    except Exception:
+                        logger.exception("Receipt callback of %s failed", tx_hash)
+                future.set_result(receipt)
+
+            time.sleep(self.poll_interval)
@@ -1,22 +1,14 @@
 import streamlit as st
-import time
 import datetime as dt
-import asyncio
 
-import strategy
+from bot.runner import BotRunner
 from ui.expanders import update_current, update_history, update_running
 from ui.params_bot import create_params_ui
 import pancake
-from utils.check import check_results
+from pancake.heads import BlockWatcher
 from utils.config import config
 
 
-async def update_ui(psp, plh_update):
-    while True:
-        update_current(psp, plh_update)
-        _ = await asyncio.sleep(1)
-
-
 def main():
     st.title("PancakeSwap Prediction V2")
 
@@ -30,6 +22,7 @@ def main():
     psp = sidebar_params["psp"]
 
     current_epoch = psp.get_current_epoch()
+    psp.prefetch(current_epoch, back_in_time=config["ui"]["back_in_time"])
 
     plh_current = st.empty()
     update_current(psp, plh_current)
@@ -49,95 +42,45 @@ def main():
     plh_status = st.empty()
 
     run_strategy = st.button("Run Strategy", disabled=psp.is_paused())
+    # one watcher per session, kept across reruns, as each one may hold a websocket subscription open
+    if "block_watcher" not in st.session_state:
+        st.session_state.block_watcher = BlockWatcher(psp.w3)
+    watcher = st.session_state.block_watcher
+    watcher.w3 = psp.w3
+    watcher.on_head = psp.set_block_number
 
     if run_strategy:
-        i_bet = 0
         btn_stop = st.button("Stop")
-        value = base_bet = sidebar_params["base_bet"]
+        runner = BotRunner(sidebar_params, psp=psp)
 
         while True:
+            psp.prefetch(psp.get_current_epoch(), back_in_time=config["ui"]["back_in_time"])
             update_current(psp, plh_current)
             update_history(psp, current_epoch, plh_history)
-            bet_status = update_running(psp, plh_running)
+            update_running(psp, plh_running)
 
-            if btn_stop or \
-                    (0 > (sidebar_params["max_loss_threshold"] * -1) >= bet_status["estimated_gain"]) or \
-                    (0 < sidebar_params["spend_threshold"] <= bet_status["total_spent"]) or \
-                    (0 < sidebar_params["gain_threshold"] <= bet_status["estimated_gain"]) or \
-                    (0 < sidebar_params["max_consecutive_loss"] >= bet_status["recent_loss_times"]):
+            if btn_stop or not runner.step():
                 plh_status.warning("Stop criteria triggered.")
                 break
+            current_epoch = psp.current_epoch
 
-            factor = sidebar_params["factor"]
-            bet_epochs = sidebar_params["bet_epochs"]
-
-            df_running = psp.get_running_df()
-            current_epoch = psp.get_current_epoch()
-            round_stats = psp.get_round_stats(current_epoch)
+            plh_timer.info(f"""
+                          Now: {dt.datetime.now()}
+                          
+                          Bet: {runner.bet_time}""")
 
-            if sidebar_params["bet_estimated_timing"]:
-                bet_time = psp.bet_time
-            else:
-                bet_time = round_stats["round_bet_time"]
+            if runner.message == "Skipped":
+                plh_status.info(runner.message)
+            elif runner.message:
+                plh_status.success(runner.message)
 
-            now = dt.datetime.now()
+            watcher.wait(runner.timeout())
 
-            plh_timer.info(f"""
-                          Now: {now}
-                          
-                          Bet: {bet_time}""")
-
-            if now >= bet_time:
-                check_results(psp)
-
-                if df_running[df_running["epoch"] == current_epoch].shape[0] == 0:
-                    if (bet_epochs == "All") \
-                            or (current_epoch % 2 == 0 and bet_epochs == "Even") \
-                            or (current_epoch % 2 == 1 and bet_epochs == "Odd"):
-
-                        bet_status = update_running(psp, plh_running)
-                        i_bet += 1
-
-                        # --- START STRATEGY HERE ---
-                        if sidebar_params["strategy"] == "Random":
-                            position, value, trx_hash = strategy.random.apply(psp, df_running, current_epoch,
-                                                                              base_bet, value, factor,
-                                                                              sidebar_params["safe_bet"],
-                                                                              bet_status)
-                        elif sidebar_params["strategy"] == "Bullish":
-                            position, value, trx_hash = strategy.bullish.apply(psp, df_running, current_epoch,
-                                                                               base_bet, value, factor,
-                                                                               sidebar_params["safe_bet"],
-                                                                               bet_status)
-                        elif sidebar_params["strategy"] == "Bearish":
-                            position, value, trx_hash = strategy.bearish.apply(psp, df_running, current_epoch,
-                                                                               base_bet, value, factor,
-                                                                               sidebar_params["safe_bet"],
-                                                                               bet_status)
-                        elif sidebar_params["strategy"] == "Same-Before":
-                            position, value, trx_hash = strategy.samebefore.apply(psp, df_running, current_epoch,
-                                                                                  base_bet, value, factor,
-                                                                                  sidebar_params["safe_bet"],
-                                                                                  bet_status)
-                        elif sidebar_params["strategy"] == "Trend":
-                            position, value, trx_hash = strategy.trend.apply(psp, df_running, current_epoch,
-                                                                             base_bet, value, factor,
-                                                                             sidebar_params["safe_bet"],
-                                                                             bet_status)
-                        elif sidebar_params["strategy"] == "EMA":
-                            position, value, trx_hash = strategy.ema.apply(psp, df_running, current_epoch,
-                                                                           base_bet, value, factor,
-                                                                           sidebar_params["safe_bet"],
-                                                                           bet_status)
-
-                        # --- END STRATEGY HERE ---
-                        plh_status.success(f"Bet #{i_bet} - Value: {value} - Position: {position} - Trx: {trx_hash}")
-                    else:
-                        plh_status.info(f"Skipped")
-
-            time.sleep(1)
-
-    asyncio.run(update_ui(psp, plh_current))
+    # the current round is refreshed on every new block until the page reruns
+    while True:
+        watcher.wait(config["heads"]["max_idle"])
+        psp.prefetch(psp.get_current_epoch(), back_in_time=config["ui"]["back_in_time"])
+        update_current(psp, plh_current)
 
 
 if __name__ == '__main__':
@@ -24,8 +24,27 @@ def main():
             if len(params_claim["wallet_address"]) > 0 and len(params_claim["private_key"]) > 0:
                 psp.set_address(params_claim["wallet_address"])
                 psp.set_private_key(params_claim["private_key"])
-                claim_hash = psp.claim(win_epochs)
-                st.success(f"Trx Hash: ***{claim_hash}***")
+                try:
+                    chunks = psp.claim_pipeline.submit(win_epochs)
+                except Exception as exc:
+                    st.error(f"Claim failed: {exc}")
+                    return
+                if len(psp.claim_pipeline.skipped) > 0:
+                    st.warning(f"Not claimable (lost or already claimed): {psp.claim_pipeline.skipped}")
+                if len(chunks) == 0:
+                    return
+
+                st.dataframe(pd.DataFrame({"epochs": [len(chunk.epochs) for chunk in chunks],
+                                           "gas": [chunk.gas for chunk in chunks],
+                                           "trx_hash": [chunk.tx_hash for chunk in chunks]}))
+                with st.spinner(f"Waiting for {len(chunks)} claim transactions..."):
+                    failed = psp.claim_pipeline.wait()
+                if len(failed) == 0:
+                    claimed = sum(len(chunk.epochs) for chunk in chunks)
+                    st.success(f"Claimed **{claimed} rounds** in **{len(chunks)} transactions**.")
+                else:
+                    failed_epochs = [epoch for chunk in failed for epoch in chunk.epochs]
+                    st.error(f"{len(failed)} claim transactions failed, epochs: {failed_epochs}")
             else:
                 st.error("Enter Wallet Address and Private Key")
 
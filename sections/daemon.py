@@ -0,0 +1,88 @@
+import os
+import time
+
+import streamlit as st
+
+from bot.control import BotControl, list_bots
+from ui.params_bot import create_params_ui
+import pancake
+from utils.config import config
+
+
+def show_state(control, plh_state, plh_running):
+    state = control.read_state()
+    alive = control.is_alive(state)
+
+    with plh_state.container():
+        if state is None:
+            st.info("The bot has not been started yet.")
+        else:
+            if alive:
+                st.success(f"Bot **{state['status']}** (pid {state['pid']}) - {state['strategy']} "
+                           f"on #{state['current_epoch']}")
+            else:
+                st.warning(f"Bot **stopped** - last update {time.ctime(state['updated'])}")
+            if state["message"]:
+                st.info(state["message"])
+
+            bet_status = state["bet_status"]
+            col1, col2, col3 = st.columns(3)
+            col1.metric(label="BETS", value=state["bets"], delta=f"Next {state['value']:.5f} BNB",
+                        delta_color="off")
+            col2.metric(label="SPENT", value=f"{bet_status['total_spent']:.5f} BNB",
+                        delta=f"Recent Loss {bet_status['recent_loss']:.5f} BNB / {bet_status['recent_loss_times']}",
+                        delta_color="off")
+            col3.metric(label="ESTIMATED GAIN", value=f"{bet_status['estimated_gain']:.5f} BNB")
+            st.caption(f"Bet: {state['bet_time']} - Lock: {state['lock_time']}")
+
+    df_running = control.load_running()
+    with plh_running.container():
+        if df_running is not None:
+            st.dataframe(df_running.style.bar(subset=['reward'], align='mid', color=['#d65f5f', '#5fba7d']))
+
+    return alive
+
+
+def main():
+    st.title("Bot Daemon")
+    st.caption("The bot runs in its own process (`python -m bot`), so it keeps betting when this page "
+               "reloads or closes. This page only reads its state and sends it commands.")
+
+    # bots started together from an instances file each have their own folder
+    bots = list_bots()
+    selected_bot = ""
+    if len(bots) > 0:
+        selected_bot = st.selectbox("Bot", options=[""] + bots, format_func=lambda x: x or "Single Bot")
+    control = BotControl(os.path.join(config["bot"]["dir"], selected_bot)) if selected_bot else BotControl()
+
+    plh_state = st.empty()
+    plh_running = st.empty()
+    alive = show_state(control, plh_state, plh_running)
+
+    if alive:
+        col1, col2, col3 = st.columns(3)
+        if col1.button("Pause"):
+            control.send("pause")
+        if col2.button("Resume"):
+            control.send("resume")
+        if col3.button("Stop"):
+            control.send("stop")
+    elif selected_bot:
+        st.caption("Bots of an instances file are started together with `python -m bot --instances`.")
+    else:
+        psp = pancake.Prediction()
+        sidebar_params = create_params_ui(psp)
+        resume = st.checkbox("Resume from the last positions", value=False)
+        if st.button("Start Bot"):
+            if len(sidebar_params["wallet_address"]) == 0:
+                st.error("Enter Wallet Address")
+            elif len(sidebar_params["private_key"]) == 0 and not config["experimental"]["debug"]:
+                st.error("Enter Private Key")
+            else:
+                process = control.start(sidebar_params, private_key=sidebar_params["private_key"], resume=resume)
+                st.success(f"Bot started (pid {process.pid}), logging to {control.log_file}")
+
+    if st.checkbox("Live", value=False):
+        while True:
+            time.sleep(config["bot"]["refresh"])
+            show_state(control, plh_state, plh_running)
@@ -1,6 +1,10 @@
-import strategy.samebefore
-import strategy.random
-import strategy.bullish
-import strategy.bearish
-import strategy.trend
-import strategy.ema
+import importlib
+
+
+def __getattr__(name):
+    # strategies are imported on first use, e.g. `strategy.trend`, any other name is a regular missing attribute
+    from strategy.registry import STRATEGIES
+
+    if f"strategy.{name}" not in STRATEGIES.values():
+        raise AttributeError(f"module 'strategy' has no attribute '{name}'")
+    return importlib.import_module(f"strategy.{name}")
@@ -0,0 +1,30 @@
+from utils.round import RoundArray
+
+
+class FeatureContext:
+    """
+    Everything the strategies need to decide on one epoch, fetched once and shared by all of them.
+    `history` holds the settled rounds before the current one, the most recent first.
+    `last_result` is the reward of the most recent settled bet, or None before the first one.
+    `states` holds the strategies' own state kept across epochs (e.g. indicators), by strategy name.
+    """
+
+    __slots__ = ["current_epoch", "round_stats", "history", "ledger", "last_result", "states"]
+
+    def __init__(self, current_epoch, round_stats, history: RoundArray, ledger, last_result, states=None):
+        self.current_epoch = current_epoch
+        self.round_stats = round_stats
+        self.history = history
+        self.ledger = ledger
+        self.last_result = last_result
+        self.states = {} if states is None else states
+
+
+def build_context(psp, current_epoch, back_in_time, round_stats=None, states=None):
+    if round_stats is None:
+        round_stats = psp.get_round_stats(current_epoch)
+
+    history = psp.get_history(current_epoch, back_in_time=back_in_time)
+    last_result = psp.ledger.last_result(current_epoch - 2)
+
+    return FeatureContext(current_epoch, round_stats, history, psp.ledger, last_result, states)
@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+
+
+def ema(prices, days, smoothing=2):
+    """
+    Vectorized EMA over prices sorted oldest first, seeded with the simple average of the first `days` prices.
+    Returns one value per price from the seed on, i.e. `len(prices) - days + 1` values.
+    """
+    prices = np.asarray(prices, dtype=float)
+    if len(prices) < days:
+        return np.array([], dtype=float)
+
+    alpha = smoothing / (1 + days)
+    series = pd.Series(np.concatenate([[prices[:days].mean()], prices[days:]]))
+    return series.ewm(alpha=alpha, adjust=False).mean().to_numpy()
+
+
+class EmaState:
+    """Streaming EMA, updated in O(1) for every new price, seeded like `ema`."""
+
+    __slots__ = ["days", "alpha", "value", "_seed"]
+
+    def __init__(self, days, smoothing=2):
+        self.days = days
+        self.alpha = smoothing / (1 + days)
+        self.value = None
+        self._seed = []
+
+    @property
+    def ready(self):
+        return self.value is not None
+
+    def update(self, price):
+        if self.value is None:
+            self._seed.append(price)
+            if len(self._seed) == self.days:
+                self.value = sum(self._seed) / self.days
+                self._seed = []
+        else:
+            self.value = price * self.alpha + self.value * (1 - self.alpha)
+        return self.value
+
+    def seed(self, prices):
+        # warms the state up from a batch of prices sorted oldest first
+        values = ema(prices, self.days)
+        if len(values) > 0:
+            self.value = values[-1]
+            self._seed = []
+        else:
+            self.value = None
+            self._seed = list(prices)
+
+
+class EmaTracker:
+    """
+    Keeps EMAs of the closing prices of settled rounds across epochs.
+    Only rounds settled since the last update are fed, so a warm tracker needs a single new round per epoch.
+    """
+
+    def __init__(self, spans=(9, 21)):
+        self.spans = spans
+        self.emas = {days: EmaState(days) for days in spans}
+        self.last_epoch = None
+        self.last_price = None
+
+    def missing_rounds(self, current_epoch):
+        # history rounds needed to bring the tracker up to date, the latest settled round is current - 2
+        if self.last_epoch is None or current_epoch - 2 - self.last_epoch > max(self.spans):
+            return max(self.spans)
+        return max(0, current_epoch - 2 - self.last_epoch)
+
+    def update(self, history):
+        """Feeds the rounds of a history sorted most recent first that are newer than the last fed one."""
+        history = history.sort()
+        if len(history) == 0:
+            return
+
+        if self.last_epoch is None or history.epoch[0] > self.last_epoch + 1:
+            # cold or out of date, warming up from the whole window at once
+            for days, state in self.emas.items():
+                state.seed(history.closePrice)
+        else:
+            for price in history.closePrice[history.epoch > self.last_epoch]:
+                for state in self.emas.values():
+                    state.update(price)
+
+        self.last_epoch = int(history.epoch[-1])
+        self.last_price = float(history.closePrice[-1])
+
+    def get(self, days):
+        return self.emas[days].value
@@ -0,0 +1,27 @@
+def next_value(context, base_bet, value, factor):
+    # back to the base bet after a win, multiplied by the factor after a loss
+    if context.last_result is None or context.last_result > 0:
+        return base_bet
+    return value * factor
+
+
+def auto_value(context, position, base_bet, safe_bet, bet_status):
+    # the bet that would cover the recent loss plus the base bet at this round's payout
+    pay_ratio = context.round_stats.get(f"{position}_pay_ratio")
+    if pay_ratio is None:
+        # no deposit in the round yet (or no position), so there is no payout to size against
+        return base_bet
+    custom_factor = pay_ratio - safe_bet
+
+    if custom_factor < 1:
+        custom_factor += safe_bet
+
+    if bet_status["estimated_gain"] >= 0:
+        loss = bet_status["recent_loss"]
+    else:
+        loss = max(bet_status["recent_loss"], abs(bet_status["estimated_gain"]))
+
+    value = (loss + base_bet) / (custom_factor - 1)
+    if value < base_bet:
+        value = base_bet
+    return value
@@ -0,0 +1,78 @@
+import importlib
+import logging
+
+from strategy.context import FeatureContext
+from strategy.martingale import auto_value, next_value
+
+logger = logging.getLogger(__name__)
+
+# strategy modules by name, imported on first use so listing the names costs nothing
+STRATEGIES = {"Trend": "strategy.trend",
+              "EMA": "strategy.ema",
+              "Random": "strategy.random",
+              "Same-Before": "strategy.samebefore",
+              "Bullish": "strategy.bullish",
+              "Bearish": "strategy.bearish"}
+
+
+def get_strategy(name):
+    return importlib.import_module(STRATEGIES[name])
+
+
+def init_states(names):
+    # state kept across epochs by the strategies that have one
+    modules = {name: get_strategy(name) for name in names}
+    return {name: module.init_state() for name, module in modules.items() if hasattr(module, "init_state")}
+
+
+def history_window(names, current_epoch=None, states=None):
+    # rounds of history the given strategies need, so one context serves all of them
+    windows = [1]
+    for name in names:
+        module = get_strategy(name)
+        if states is not None and name in states and hasattr(module, "get_history_window"):
+            windows.append(module.get_history_window(states[name], current_epoch))
+        else:
+            windows.append(module.HISTORY)
+    return max(windows)
+
+
+def decide(name, context, base_bet, value, factor, safe_bet, bet_status):
+    position = get_strategy(name).decide(context)
+
+    value = next_value(context, base_bet, value, factor)
+    if factor == 0:
+        value = auto_value(context, position, base_bet, safe_bet, bet_status)
+
+    return position, value
+
+
+def expected_values(psp, current_epoch, round_stats, base_bet, value, factor, safe_bet):
+    # the stake the next decision will use on each side, as `decide` computes it: the auto factor
+    # depends on the side's payout, so it changes with the pools and is computed again every block
+    context = FeatureContext(current_epoch, round_stats, None, psp.ledger, psp.ledger.last_result(current_epoch - 2))
+    if factor != 0:
+        value = next_value(context, base_bet, value, factor)
+        return {"bull": value, "bear": value}
+    bet_status = psp.ledger.status()
+    return {position: auto_value(context, position, base_bet, safe_bet, bet_status) for position in ("bull", "bear")}
+
+
+def apply(name, psp, context, base_bet, value, factor, safe_bet, bet_status, verbose=True):
+    """
+    Decides the position and value of a strategy on the shared context, then places the bet.
+    Martingle technique is applied to every strategy. The decision is logged unless `verbose` is off.
+    """
+    position, value = decide(name, context, base_bet, value, factor, safe_bet, bet_status)
+
+    if position == "bull":
+        trx_hash = psp.bet_bull(value)
+    elif position == "bear":
+        trx_hash = psp.bet_bear(value)
+    else:
+        trx_hash = None
+
+    if verbose:
+        logger.info("[%s] %s: %s - V: %s - F: x%s - Loss: %s", context.current_epoch, name, position, value,
+                    factor, bet_status["recent_loss"])
+    return position, value, trx_hash
@@ -0,0 +1,132 @@
+from collections import deque
+
+import numpy as np
+
+
+def _fit(n, sx, sxx, sy, sxy, syy):
+    # least squares line over x = 0..n-1 from its running sums
+    denominator = n * sxx - sx * sx
+    if n < 2 or denominator == 0:
+        return 0.0, (sy / n if n > 0 else 0.0), 0.0
+
+    covariance = n * sxy - sx * sy
+    slope = covariance / denominator
+    intercept = (sy - slope * sx) / n
+
+    variance_y = n * syy - sy * sy
+    r2 = covariance * covariance / (denominator * variance_y) if variance_y > 0 else 0.0
+    return slope, intercept, r2
+
+
+def rolling_regression(y, window):
+    """
+    Slope, intercept and R² of every `window` consecutive values of y (sorted oldest first),
+    each fitted over x = 0..window-1. Returns three arrays of `len(y) - window + 1` values.
+    """
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n < window:
+        empty = np.array([], dtype=float)
+        return empty, empty, empty
+
+    x = np.arange(n, dtype=float)
+    cy = np.concatenate([[0.0], np.cumsum(y)])
+    cxy = np.concatenate([[0.0], np.cumsum(x * y)])
+    cyy = np.concatenate([[0.0], np.cumsum(y * y)])
+
+    start = np.arange(n - window + 1)
+    sy = cy[start + window] - cy[start]
+    syy = cyy[start + window] - cyy[start]
+    # x restarts at zero in every window
+    sxy = cxy[start + window] - cxy[start] - start * sy
+
+    sx = window * (window - 1) / 2
+    sxx = (window - 1) * window * (2 * window - 1) / 6
+
+    denominator = window * sxx - sx * sx
+    covariance = window * sxy - sx * sy
+    slope = covariance / denominator if denominator != 0 else np.zeros_like(sy)
+    intercept = (sy - slope * sx) / window
+
+    variance_y = window * syy - sy * sy
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r2 = np.where(variance_y > 0, covariance * covariance / (denominator * variance_y), 0.0)
+    return slope, intercept, r2
+
+
+class RollingRegression:
+    """Least squares line over the last `window` values, updated in O(1) with running sums."""
+
+    __slots__ = ["window", "values", "sy", "sxy", "syy"]
+
+    def __init__(self, window):
+        self.window = window
+        self.values = deque()
+        self.sy = 0.0
+        self.sxy = 0.0
+        self.syy = 0.0
+
+    def update(self, value):
+        if len(self.values) == self.window:
+            oldest = self.values.popleft()
+            # every remaining value moves one step back on x
+            self.sy -= oldest
+            self.syy -= oldest * oldest
+            self.sxy -= self.sy
+        self.sxy += len(self.values) * value
+        self.sy += value
+        self.syy += value * value
+        self.values.append(value)
+
+    def reset(self):
+        self.values.clear()
+        self.sy = 0.0
+        self.sxy = 0.0
+        self.syy = 0.0
+
+    def fit(self):
+        n = len(self.values)
+        sx = n * (n - 1) / 2
+        sxx = (n - 1) * n * (2 * n - 1) / 6
+        return _fit(n, sx, sxx, self.sy, self.sxy, self.syy)
+
+    @property
+    def slope(self):
+        return self.fit()[0]
+
+
+class RegressionTracker:
+    """
+    Keeps a rolling regression of the closing prices of settled rounds across epochs.
+    Only rounds settled since the last update are fed.
+    """
+
+    def __init__(self, window):
+        self.regression = RollingRegression(window)
+        self.last_epoch = None
+
+    def missing_rounds(self, current_epoch):
+        # history rounds needed to bring the tracker up to date, the latest settled round is current - 2
+        window = self.regression.window
+        if self.last_epoch is None or current_epoch - 2 - self.last_epoch > window:
+            return window - 1
+        return max(0, current_epoch - 2 - self.last_epoch)
+
+    def update(self, history):
+        """Feeds the rounds of a history that are newer than the last fed one."""
+        history = history.sort()
+        if len(history) == 0:
+            return
+
+        if self.last_epoch is None or history.epoch[0] > self.last_epoch + 1:
+            self.regression.reset()
+            prices = history.closePrice
+        else:
+            prices = history.closePrice[history.epoch > self.last_epoch]
+
+        for price in prices:
+            self.regression.update(float(price))
+        self.last_epoch = int(history.epoch[-1])
+
+    def fit(self):
+        return self.regression.fit()
@@ -0,0 +1,73 @@
+import random
+
+from backtest.engine import run_backtest
+from backtest.simulator import SimulatedPrediction
+from utils.round import Round, RoundArray
+
+
+def make_rounds(count, seed=0):
+    rng = random.Random(seed)
+    rounds = []
+    price = 300.0
+    for epoch in range(1, count + 1):
+        close_price = price + rng.uniform(-1, 1)
+        bull_amount, bear_amount = rng.uniform(1, 5), rng.uniform(1, 5)
+        start = 1700000000 + 300 * epoch
+        rounds.append(Round(epoch, start, start + 300, start + 600, price, close_price, 0, 0,
+                            bull_amount + bear_amount, bull_amount, bear_amount,
+                            bull_amount + bear_amount, 0.97 * (bull_amount + bear_amount), True))
+        price = close_price
+    return RoundArray(rounds)
+
+
+def test_simulator_has_the_whole_prediction_interface():
+    psp = SimulatedPrediction(make_rounds(10))
+
+    for name in ("ledger", "round_cache", "block_cache", "clock", "bet_preparer", "receipt_tracker",
+                 "claim_pipeline", "nonce_manager"):
+        assert hasattr(psp, name), name
+    assert psp.debug
+
+
+def test_backtest_replays_every_strategy_offline():
+    rounds = make_rounds(120)
+
+    for strategy_name in ("Trend", "EMA", "Same-Before", "Bullish", "Bearish"):
+        result = run_backtest(rounds, strategy_name, 0.001, factor=2.0)
+        assert result["bets"] > 0, strategy_name
+        assert result["wins"] + result["losses"] <= result["bets"]
+
+
+def test_backtest_skips_epochs_after_a_gap():
+    rounds = make_rounds(200)
+    kept = [i for i, epoch in enumerate(rounds.epoch.tolist()) if not 100 < epoch < 150 and epoch != 170]
+    gapped = rounds[kept]
+    stored = set(gapped.epoch.tolist())
+
+    for strategy_name in ("Trend", "EMA", "Same-Before", "Bullish", "Bearish"):
+        result = run_backtest(gapped, strategy_name, 0.001, factor=2.0)
+        assert result["bets"] > 0, strategy_name
+
+    # Same-Before decides on the round of current - 2 only, and never on an older one in its place
+    bets = run_backtest(gapped, "Same-Before", 0.001, factor=2.0)["df_running"]["epoch"].tolist()
+    assert all(epoch - 2 in stored for epoch in bets)
+    assert 172 not in bets
+
+
+def test_auto_factor_sizes_on_the_pools_at_bet_time():
+    rounds = make_rounds(120)
+    # at bet time, the bull side only held a tenth of its final pool, so it paid far more than it ends up paying
+    pools = {data.epoch: [(data.startTimestamp + 10, data.bullAmount / 10, data.bearAmount),
+                          (data.lockTimestamp - 5, data.bullAmount, data.bearAmount)] for data in rounds}
+    psp = SimulatedPrediction(rounds, pools)
+
+    stats = psp.get_bet_stats(50)
+    assert stats["bull_pay_ratio"] > psp.get_round_stats(50)["bull_pay_ratio"]
+    # the result is still settled on the final pools
+    assert psp.get_round(50).bullAmount == rounds[49].bullAmount
+
+    final = run_backtest(rounds, "Bullish", 0.001)["df_running"]
+    at_bet_time = run_backtest(rounds, "Bullish", 0.001, pools=pools)["df_running"]
+    assert final["epoch"].tolist() == at_bet_time["epoch"].tolist()
+    # same bets and outcomes, but recovering a loss at a higher payout takes a smaller stake
+    assert at_bet_time["amount"].sum() < final["amount"].sum()
@@ -0,0 +1,99 @@
+from concurrent.futures import Future
+from types import SimpleNamespace
+
+from pancake.claims import ClaimPipeline
+from pancake.ledger import PositionLedger
+from utils.config import config
+
+BASE_GAS = 50000
+EPOCH_GAS = 20000
+
+
+class ClaimCall:
+    def __init__(self, chain, epochs):
+        self.chain = chain
+        self.epochs = epochs
+
+    def estimate_gas(self, transaction):
+        if any(epoch not in self.chain.claimable for epoch in self.epochs):
+            raise ValueError("execution reverted: Not eligible for claim")
+        return BASE_GAS + EPOCH_GAS * len(self.epochs)
+
+
+class FakeChain:
+    """Just the part of `Prediction` the claim pipeline uses, over a set of claimable epochs."""
+
+    def __init__(self, claimable, reverted=()):
+        self.claimable = set(claimable)
+        self.reverted = set(reverted)
+        self.debug = False
+        self.address = "0x0000000000000000000000000000000000000001"
+        self.ledger = PositionLedger()
+        self.sent = []
+
+        self.w3 = SimpleNamespace(eth=SimpleNamespace(gas_price=1000000000))
+        self.prediction_contract = SimpleNamespace(
+            functions=SimpleNamespace(claim=lambda epochs: ClaimCall(self, epochs)))
+        self.receipt_tracker = SimpleNamespace(track=self._track)
+
+    def get_claimable(self, epochs):
+        return [epoch for epoch in epochs if epoch in self.claimable]
+
+    def send_transaction(self, function, value=0, gas=None, gas_price=None):
+        self.sent.append((function.epochs, gas))
+        return f"0x{len(self.sent):064x}"
+
+    def _track(self, tx_hash, on_receipt=None):
+        epochs = self.sent[int(tx_hash, 16) - 1][0]
+        receipt = {"status": 0 if self.reverted & set(epochs) else 1, "gasUsed": 0}
+        on_receipt(receipt)
+        future = Future()
+        future.set_result(receipt)
+        return future
+
+
+def test_estimate_fits_base_and_per_epoch_gas():
+    pipeline = ClaimPipeline(FakeChain(range(1, 11)), gas_margin=1.0)
+
+    assert pipeline.estimate(list(range(1, 11))) == (BASE_GAS, EPOCH_GAS)
+
+
+def test_estimate_falls_back_on_revert():
+    pipeline = ClaimPipeline(FakeChain([]), gas_margin=1.0)
+
+    assert pipeline.estimate([1, 2, 3]) == tuple(config["claim"]["default_gas"])
+
+
+def test_plan_splits_evenly_under_max_gas():
+    pipeline = ClaimPipeline(FakeChain(range(1, 101)), max_gas=BASE_GAS + 30 * EPOCH_GAS,
+                             max_epochs=1000, gas_margin=1.0)
+
+    chunks = pipeline.plan(list(range(1, 101)))
+
+    assert [len(chunk) for chunk in chunks] == [25, 25, 25, 25]
+    assert all(pipeline.gas_for(len(chunk)) <= pipeline.max_gas for chunk in chunks)
+
+
+def test_submit_skips_unclaimable_epochs():
+    chain = FakeChain(claimable=[1, 2, 4])
+    pipeline = ClaimPipeline(chain, gas_margin=1.0)
+
+    chunks = pipeline.submit([1, 2, 3, 4])
+
+    assert pipeline.skipped == [3]
+    assert [chunk.epochs for chunk in chunks] == [[1, 2, 4]]
+    assert chunks[0].gas == BASE_GAS + 3 * EPOCH_GAS
+
+
+def test_reverted_chunk_clears_the_claim_hash():
+    chain = FakeChain(claimable=range(1, 7), reverted=[5])
+    for epoch in range(1, 7):
+        chain.ledger.append(epoch, "bull", 0.1, "0x")
+    pipeline = ClaimPipeline(chain, max_gas=BASE_GAS + 3 * EPOCH_GAS, gas_margin=1.0)
+
+    chunks = pipeline.submit(list(range(1, 7)), checked=True)
+    failed = pipeline.wait()
+
+    assert [chunk.epochs for chunk in chunks] == [[1, 2, 3], [4, 5, 6]]
+    assert failed == [chunks[1]]
+    assert chain.ledger.unclaimed(6) == [4, 5, 6]
@@ -0,0 +1,13 @@
+from pancake.clock import RoundClock
+
+
+def test_each_lock_is_one_sample_however_many_forks_report_it():
+    clock = RoundClock()
+    single = RoundClock()
+
+    for lock_timestamp in (1000, 1300, 1600):
+        for _ in range(5):
+            clock.observe_lock(lock_timestamp, lock_timestamp + 4)
+        single.observe_lock(lock_timestamp, lock_timestamp + 4)
+
+    assert clock.lock_delay == single.lock_delay
@@ -0,0 +1,130 @@
+from types import SimpleNamespace
+
+from eth_abi import encode as abi_encode
+from eth_utils import event_abi_to_log_topic
+from web3 import Web3
+
+from pancake.events import EventIngestor
+from utils.abi import get_abi
+from utils.config import config
+from utils.store import RoundStore
+
+GENESIS = 1700000000
+# 3 s blocks, a round starts every 100 blocks
+INTERVAL = 300
+SENDER = "0x00000000000000000000000000000000000000aA"
+
+
+def block_timestamp(number):
+    return GENESIS + 3 * number
+
+
+class FakeEth:
+    """The logs of a chain where epoch e starts at block 100 e, and its pools grow at blocks +10 and +50."""
+
+    def __init__(self, contract, epochs):
+        self.contract = contract
+        self.block_number = 100 * (epochs + 1)
+        self.logs = []
+        for epoch in range(1, epochs + 1):
+            block = 100 * epoch
+            self.log(block, "StartRound", [("uint256", epoch)], [])
+            if epoch > 1:
+                self.log(block, "LockRound", [("uint256", epoch - 1), ("uint256", 1)], [("int256", 30000000000)])
+            if epoch > 2:
+                self.log(block, "EndRound", [("uint256", epoch - 2), ("uint256", 2)],
+                         [("int256", 30000000000 + epoch * 1000000)])
+                self.log(block, "RewardsCalculated", [("uint256", epoch - 2)],
+                         [("uint256", 10 ** 18), ("uint256", 97 * 10 ** 16), ("uint256", 3 * 10 ** 16)])
+            self.log(block + 10, "BetBull", [("address", SENDER), ("uint256", epoch)], [("uint256", 10 ** 17)])
+            self.log(block + 10, "BetBear", [("address", SENDER), ("uint256", epoch)], [("uint256", 2 * 10 ** 17)])
+            self.log(block + 50, "BetBull", [("address", SENDER), ("uint256", epoch)], [("uint256", 7 * 10 ** 17)])
+            if epoch > 3:
+                self.log(block + 20, "Claim", [("address", SENDER), ("uint256", epoch - 3)], [("uint256", 10 ** 18)])
+        self.logs.sort(key=lambda log: log["blockNumber"])
+        self.requests = []
+
+    def log(self, block, name, indexed, data):
+        topic = event_abi_to_log_topic(getattr(self.contract.events, name)().abi)
+        self.logs.append({"blockNumber": block,
+                          "topics": [topic] + [abi_encode([arg_type], [value]) for arg_type, value in indexed],
+                          "data": abi_encode([arg_type for arg_type, _ in data], [value for _, value in data])})
+
+    def get_logs(self, params):
+        self.requests.append((params["fromBlock"], params["toBlock"]))
+        return [log for log in self.logs if params["fromBlock"] <= log["blockNumber"] <= params["toBlock"]]
+
+    def get_block(self, number):
+        if number == "latest":
+            number = self.block_number
+        return {"number": number, "timestamp": block_timestamp(number)}
+
+
+def make_ingestor(tmp_path, epochs=12, name="rounds.db"):
+    contract = Web3().eth.contract(address=config["general"]["smart_contract"], abi=get_abi())
+    eth = FakeEth(contract, epochs)
+    psp = SimpleNamespace(w3=SimpleNamespace(eth=eth), prediction_contract=contract,
+                          round_store=RoundStore(str(tmp_path / name)))
+    ingestor = EventIngestor(psp)
+    ingestor.interval_seconds = INTERVAL
+    return ingestor, eth
+
+
+def test_logs_decode_in_order(tmp_path):
+    ingestor, eth = make_ingestor(tmp_path, epochs=4)
+
+    events = ingestor.decode(eth.logs)
+
+    assert [event["blockNumber"] for event in events] == [log["blockNumber"] for log in eth.logs]
+    claim = next(event for event in events if event["event"] == "Claim")
+    assert claim["args"] == {"sender": SENDER.lower(), "epoch": 1, "amount": 10 ** 18}
+    lock = next(event for event in events if event["event"] == "LockRound")
+    assert lock["args"] == {"epoch": 1, "roundId": 1, "price": 30000000000}
+    rewards = next(event for event in events if event["event"] == "RewardsCalculated")
+    assert rewards["args"]["rewardAmount"] == 97 * 10 ** 16
+
+
+def test_ingest_rebuilds_rounds_and_their_pool_evolution(tmp_path):
+    ingestor, eth = make_ingestor(tmp_path)
+
+    result = ingestor.ingest(0, eth.block_number)
+
+    # a round is complete once the one two epochs later has started
+    assert result["rounds"].epoch.tolist() == list(range(1, 11))
+    data = result["rounds"][2]
+    assert data.startTimestamp == block_timestamp(300)
+    assert data.lockTimestamp == block_timestamp(300) + INTERVAL
+    assert data.closeTimestamp == block_timestamp(400) + INTERVAL
+    assert (data.bullAmount, data.bearAmount) == (0.8, 0.2)
+    assert data.closePrice == (30000000000 + 5 * 1000000) / 100000000
+
+    assert result["pools"][3] == [(block_timestamp(310), 0.1, 0.2), (block_timestamp(350), 0.8, 0.2)]
+    assert len(result["claims"]) == 9
+
+    store = ingestor.psp.round_store
+    assert store.missing(1, 10) == []
+    assert store.get_pools(3, 3) == {3: result["pools"][3]}
+
+
+def test_backfill_fills_the_gaps_of_the_store(tmp_path):
+    reference, _ = make_ingestor(tmp_path, name="reference.db")
+    expected = {data.epoch: data for data in reference.ingest(0, reference.w3.eth.block_number)["rounds"]}
+
+    ingestor, eth = make_ingestor(tmp_path)
+    store = ingestor.psp.round_store
+    store.save_many([expected[epoch] for epoch in (1, 2, 3, 7, 8, 9, 10)])
+
+    def call(functions):
+        # only the start timestamp of a round is used to locate its blocks
+        return [(function.args[0], block_timestamp(100 * function.args[0])) for function in functions]
+
+    ingestor.psp.multicall = SimpleNamespace(call=call)
+    ingestor.psp.get_rounds = lambda epochs: None
+
+    assert ingestor.backfill(1, 10) == 3
+    assert store.missing(1, 10) == []
+    assert [store.get(epoch) for epoch in (4, 5, 6)] == [expected[epoch] for epoch in (4, 5, 6)]
+    assert sorted(store.get_pools(1, 10)) == [4, 5, 6]
+    # only the blocks around the gap are read
+    assert min(start for start, _ in eth.requests) >= 400 - ingestor.block_margin - 1
+    assert max(end for _, end in eth.requests) <= 800 + ingestor.block_margin + 1
@@ -0,0 +1,26 @@
+import threading
+
+from pancake.ledger import PositionLedger
+
+
+def test_receipts_from_another_thread_keep_the_status_consistent():
+    ledger = PositionLedger(capacity=1)
+    appended = threading.Semaphore(0)
+    count = 2000
+
+    def record_receipts():
+        # every other bet reverts, as the receipt tracker would report it
+        for epoch in range(count):
+            appended.acquire()
+            ledger.set_receipt(epoch, "reverted" if epoch % 2 else "success", 21000)
+
+    tracker = threading.Thread(target=record_receipts)
+    tracker.start()
+    for epoch in range(count):
+        ledger.append(epoch, "bull", 1.0, f"0x{epoch:x}")
+        appended.release()
+    tracker.join()
+
+    assert len(ledger) == count
+    assert ledger.status()["total_spent"] == count / 2
+    assert ledger.to_df()["tx_status"].value_counts().to_dict() == {"success": count / 2, "reverted": count / 2}
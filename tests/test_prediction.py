@@ -0,0 +1,62 @@
+import time
+
+import pytest
+from web3 import Web3
+from web3.providers.base import JSONBaseProvider
+
+from pancake import Prediction
+from utils.config import config
+
+
+class ChainIdProvider(JSONBaseProvider):
+    """Answers eth_chainId only, all the bootstrap reads from the node."""
+
+    def make_request(self, method, params):
+        return {"jsonrpc": "2.0", "id": 1, "result": hex(56)}
+
+    def is_connected(self, show_traceback=False):
+        return True
+
+
+def test_failed_bootstrap_is_retried(monkeypatch, tmp_path):
+    attempts = []
+
+    def init_w3(self):
+        attempts.append(True)
+        if len(attempts) == 1:
+            raise ConnectionError("node unreachable")
+        self._w3 = Web3(ChainIdProvider())
+
+    monkeypatch.setattr(Prediction, "_init_w3", init_w3)
+    monkeypatch.setattr("pancake.prediction.RoundStore", lambda: None)
+    monkeypatch.setitem(config["abi"], "cache_dir", str(tmp_path))
+    psp = Prediction(lazy=True)
+
+    with pytest.raises(ConnectionError):
+        psp.w3
+    assert psp.chain_id == 56
+    assert psp.prediction_contract.address == psp.smart_contract
+    assert len(attempts) == 2
+
+
+def test_offline_prediction_has_no_client_and_no_store():
+    psp = Prediction(offline=True)
+
+    assert psp.w3 is None
+    assert psp.round_store is None
+
+
+def test_prefetch_reads_concurrently(monkeypatch):
+    def slow_read(*args, **kwargs):
+        time.sleep(0.2)
+
+    for name in ("get_round", "is_paused", "get_balance", "get_history"):
+        monkeypatch.setattr(Prediction, name, slow_read)
+    monkeypatch.setattr(Prediction, "_bootstrap", lambda self: self._ready.set())
+    monkeypatch.setattr("pancake.prediction.RoundStore", lambda: None)
+    psp = Prediction(address="0x0000000000000000000000000000000000000001", lazy=True)
+
+    start = time.monotonic()
+    psp.prefetch(100, back_in_time=20)
+
+    assert time.monotonic() - start < 0.4
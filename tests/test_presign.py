@@ -0,0 +1,64 @@
+from types import SimpleNamespace
+
+from pancake.ledger import PositionLedger
+from pancake.presign import BetPreparer
+from strategy import registry
+from strategy.context import FeatureContext
+
+
+class FakeWallet:
+    """Just the part of `Prediction` the bet preparer uses, counting the transactions it signs."""
+
+    def __init__(self):
+        self.address = "0x0000000000000000000000000000000000000001"
+        self.ledger = PositionLedger()
+        self.signed = []
+        self.nonce_manager = SimpleNamespace(peek=lambda address: 7, commit=lambda address, nonce: True)
+        self.prediction_contract = SimpleNamespace(functions=SimpleNamespace(
+            betBull=lambda epoch: ("bull", epoch), betBear=lambda epoch: ("bear", epoch)))
+
+    def sign_transaction(self, function, nonce, value=0):
+        self.signed.append((function[0], value))
+        return SimpleNamespace(rawTransaction=f"{function[0]}:{value}".encode())
+
+
+def round_stats(bull_pay_ratio, bear_pay_ratio):
+    return {"bull_pay_ratio": bull_pay_ratio, "bear_pay_ratio": bear_pay_ratio}
+
+
+def test_auto_factor_stakes_match_the_decision():
+    psp = FakeWallet()
+    psp.ledger.append(8, "bull", 0.01, "0x", reward=-0.01)
+    stats = round_stats(1.4, 3.2)
+
+    values = registry.expected_values(psp, 10, stats, 0.001, 0.01, 0, 0.2)
+
+    context = FeatureContext(10, stats, None, psp.ledger, psp.ledger.last_result(8))
+    for position in ("bull", "bear"):
+        _, value = registry.decide("Bullish" if position == "bull" else "Bearish", context,
+                                   0.001, 0.01, 0, 0.2, psp.ledger.status())
+        assert values[position] == value
+    assert values["bull"] > values["bear"]
+
+
+def test_only_the_side_whose_stake_moved_is_signed_again():
+    psp = FakeWallet()
+    preparer = BetPreparer(psp)
+
+    preparer.prepare(10, {"bull": 100, "bear": 200})
+    preparer.prepare(10, {"bull": 100, "bear": 250})
+
+    assert psp.signed == [("bull", 100), ("bear", 200), ("bear", 250)]
+    assert preparer.take(10, "bear", 200) is None
+
+    preparer.prepare(10, {"bull": 100, "bear": 250})
+    assert preparer.take(10, "bear", 250).raw_transaction == b"bear:250"
+
+
+def test_empty_pools_fall_back_to_the_base_bet():
+    psp = FakeWallet()
+    psp.ledger.append(8, "bull", 0.01, "0x", reward=-0.01)
+
+    values = registry.expected_values(psp, 10, round_stats(None, None), 0.001, 0.01, 0, 0.2)
+
+    assert values == {"bull": 0.001, "bear": 0.001}
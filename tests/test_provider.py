@@ -0,0 +1,102 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from utils.provider import ProviderPool
+
+
+class StubNode:
+    """Local JSON-RPC stand-in answering eth_blockNumber, or failing with HTTP 500 while `failing` is set."""
+
+    def __init__(self, block_number):
+        self.block_number = block_number
+        self.failing = False
+        self.requests = 0
+
+        node = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                node.requests += 1
+                if node.failing:
+                    self.send_response(500)
+                    self.end_headers()
+                    return
+                body = json.dumps({"jsonrpc": "2.0", "id": request["id"],
+                                   "result": hex(node.block_number)}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def nodes():
+    nodes = [StubNode(100), StubNode(200), StubNode(300)]
+    yield nodes
+    for node in nodes:
+        node.close()
+
+
+def block_number(pool):
+    return int(pool.make_request("eth_blockNumber", [])["result"], 16)
+
+
+def test_fails_over_to_a_healthy_node(nodes):
+    nodes[0].failing = True
+    pool = ProviderPool([node.url for node in nodes[:2]], max_failures=3, cooldown=60)
+
+    assert block_number(pool) == 200
+    assert nodes[0].requests == 1
+
+
+def test_ejects_a_failing_node_and_recovers_it_after_cooldown(nodes):
+    nodes[0].failing = True
+    pool = ProviderPool([nodes[0].url], max_failures=2, cooldown=0.5)
+
+    for _ in range(2):
+        with pytest.raises(Exception):
+            block_number(pool)
+    assert pool.get_stats()[0]["ejected"]
+    assert not pool.is_connected()
+
+    nodes[0].failing = False
+    time.sleep(0.6)
+    assert pool.is_connected()
+    assert block_number(pool) == 100
+    assert not pool.get_stats()[0]["ejected"]
+
+
+def test_ejected_node_gets_no_traffic_while_others_are_healthy(nodes):
+    nodes[0].failing = True
+    pool = ProviderPool([node.url for node in nodes], max_failures=1, cooldown=60)
+
+    block_number(pool)
+    failed_requests = nodes[0].requests
+    for _ in range(5):
+        assert block_number(pool) in (200, 300)
+    assert nodes[0].requests == failed_requests
+    assert pool.get_stats()[0]["ejected"]
+
+
+def test_unreachable_node_is_skipped(nodes):
+    nodes[1].close()
+    pool = ProviderPool([nodes[1].url, nodes[2].url], max_failures=1, cooldown=60, timeout=1)
+
+    assert block_number(pool) == 300
@@ -0,0 +1,39 @@
+import numpy as np
+
+from strategy.regression import RollingRegression, rolling_regression
+
+
+def polyfit_windows(y, window):
+    x = np.arange(window)
+    fits = [np.polyfit(x, y[start:start + window], 1) for start in range(len(y) - window + 1)]
+    r2 = [np.corrcoef(x, y[start:start + window])[0, 1] ** 2 for start in range(len(y) - window + 1)]
+    return np.array([fit[0] for fit in fits]), np.array([fit[1] for fit in fits]), np.array(r2)
+
+
+def test_batch_regression_matches_polyfit():
+    y = 300 + np.cumsum(np.random.default_rng(0).normal(size=200))
+
+    slope, intercept, r2 = rolling_regression(y, 4)
+    expected_slope, expected_intercept, expected_r2 = polyfit_windows(y, 4)
+
+    assert len(slope) == len(y) - 3
+    np.testing.assert_allclose(slope, expected_slope, atol=1e-8)
+    np.testing.assert_allclose(intercept, expected_intercept, atol=1e-6)
+    np.testing.assert_allclose(r2, expected_r2, atol=1e-8)
+
+
+def test_batch_regression_matches_the_streaming_one():
+    y = 300 + np.cumsum(np.random.default_rng(1).normal(size=50))
+    regression = RollingRegression(5)
+
+    streamed = []
+    for value in y:
+        regression.update(value)
+        if len(regression.values) == regression.window:
+            streamed.append(regression.fit())
+
+    np.testing.assert_allclose(np.array(streamed).T, np.array(rolling_regression(y, 5)), atol=1e-6)
+
+
+def test_batch_regression_of_a_short_series_is_empty():
+    assert all(len(values) == 0 for values in rolling_regression([1.0, 2.0], 3))
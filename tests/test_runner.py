@@ -0,0 +1,63 @@
+import time
+
+from backtest.simulator import SimulatedPrediction
+from bot.control import BotControl
+from bot.runner import BotRunner
+from pancake.ledger import PositionLedger
+from utils.round import Round, RoundArray
+
+PARAMS = {"strategy": "Trend", "base_bet": 0.001, "factor": 0.0, "safe_bet": 0.2, "bet_epochs": "All",
+          "bet_estimated_timing": True, "max_loss_threshold": 0.0, "max_consecutive_loss": 0,
+          "gain_threshold": 0.0, "spend_threshold": 0.0}
+
+
+class UnreachablePrediction:
+    """Just the part of `Prediction` the runner publishes, over a node that cannot be reached."""
+
+    def __init__(self):
+        self.reads = 0
+        self.ledger = PositionLedger()
+        self.address = "0x0000000000000000000000000000000000000001"
+        self.current_epoch = 0
+        self.lock_time = None
+
+    def get_current_epoch(self):
+        self.reads += 1
+        raise ConnectionError(f"node unreachable ({self.reads})")
+
+    def get_running_df(self):
+        return self.ledger.to_df()
+
+
+def test_failing_step_is_published_and_retried(tmp_path):
+    psp = UnreachablePrediction()
+    control = BotControl(str(tmp_path))
+    runner = BotRunner(PARAMS, psp=psp, control=control)
+
+    assert runner.tick()
+    state = control.read_state()
+    assert state["status"] == "running"
+    assert "node unreachable" in state["message"]
+
+    assert runner.tick()
+    assert psp.reads == 2
+    assert "node unreachable (2)" in control.read_state()["message"]
+
+
+def test_stop_command_stops_the_bot(tmp_path):
+    control = BotControl(str(tmp_path))
+    runner = BotRunner(PARAMS, psp=UnreachablePrediction(), control=control)
+
+    control.send("stop")
+    assert not runner.tick()
+    assert control.read_state()["status"] == "stopped"
+
+
+def test_step_on_a_round_without_deposits():
+    start = int(time.time())
+    empty_round = Round(10, start, start + 3600, start + 7200, 0.0, 0.0, 0, 0, 0.0, 0.0, 0.0, 0.0, 0.0, False)
+    psp = SimulatedPrediction(RoundArray([empty_round]))
+    psp.set_epoch(10)
+    runner = BotRunner(dict(PARAMS, bet_estimated_timing=False), psp=psp)
+
+    assert runner.step()
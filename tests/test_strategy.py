@@ -0,0 +1,19 @@
+import inspect
+import sys
+
+import pytest
+
+import strategy
+from strategy import registry
+
+
+def test_strategy_modules_resolve_on_first_use():
+    assert strategy.samebefore.decide is registry.get_strategy("Same-Before").decide
+
+
+def test_other_names_are_missing_attributes():
+    assert not hasattr(strategy, "__wrapped__")
+    assert inspect.unwrap(strategy) is strategy
+    with pytest.raises(AttributeError):
+        strategy.not_a_strategy
+    assert "strategy.not_a_strategy" not in sys.modules
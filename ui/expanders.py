@@ -1,4 +1,3 @@
-import math
 import pandas as pd
 import streamlit as st
 import datetime as dt
@@ -14,14 +13,14 @@ def update_current(psp, plh_update):
         # current round
         current_epoch = psp.get_current_epoch()
 
-        df_current_round = psp.get_round(current_epoch)
+        current_round = psp.get_round(current_epoch)
         current_expander = st.expander(f"Current #{current_epoch}", expanded=True)
         with current_expander:
             if is_paused:
                 st.error("Pancake Prediction is currently paused.")
             round_stats = psp.get_round_stats(current_epoch)
-            bull_amount = df_current_round["bullAmount"].iloc[0]
-            bear_amount = df_current_round["bearAmount"].iloc[0]
+            bull_amount = current_round.bullAmount
+            bear_amount = current_round.bearAmount
             total_amount = round_stats["total_amount"]
             bull_ratio = round_stats["bull_ratio"]
             bear_ratio = round_stats["bear_ratio"]
@@ -33,7 +32,7 @@ def update_current(psp, plh_update):
             round_lock_time = round_stats["round_lock_time"]
             round_close_time = round_stats["round_close_time"]
 
-            # st.write(df_current_round[current_round_columns])
+            # st.write(current_round)
 
             if total_amount > 0:
                 col1, col2, col3 = st.columns(3)
@@ -81,39 +80,31 @@ def update_current(psp, plh_update):
 
 
 def update_running(psp, plh_update):
-    # running history
-    df_running = psp.get_running_df()
+    # running history, restored from the session after a rerun
+    if "df_running" in st.session_state and len(psp.ledger) == 0 and st.session_state.df_running.shape[0] > 0:
+        psp.set_df_running(st.session_state.df_running)
+
+    # the frame is only rebuilt when the ledger has changed since the last render
+    if st.session_state.get("ledger_version") != (id(psp.ledger), psp.ledger.version):
+        st.session_state.df_running = psp.get_running_df()
+        st.session_state.ledger_version = (id(psp.ledger), psp.ledger.version)
+    df_running = st.session_state.df_running
+
     with plh_update:
         running_expander = st.expander(f"Positions History (#{df_running.shape[0]})", expanded=True)
         with running_expander:
-            if "df_running" in st.session_state:
-                if not st.session_state.df_running.equals(df_running):
-                    if df_running.shape[0] == 0:
-                        psp.set_df_running(st.session_state.df_running)
-                    else:
-                        st.session_state.df_running = df_running.copy()
-            else:
-                st.session_state.df_running = df_running.copy()
-
-            df_running = st.session_state.df_running.copy()
             st.dataframe(df_running.style.bar(subset=['reward'], align='mid', color=['#d65f5f', '#5fba7d']))
 
-            total_spent = df_running.sum()["amount"]
-            total_loss = abs(df_running[df_running["reward"] < 0].sum()["reward"])
-            loss_times = df_running[df_running["reward"] < 0].count()["reward"]
-            estimated_win = df_running[df_running["reward"] > 0].sum()["reward"]
-            win_times = df_running[df_running["reward"] > 0].count()["reward"]
-            estimated_gain = df_running.sum()["reward"]
-            max_spent = df_running.max()["amount"]
-
-            last_win_epoch = df_running[df_running["reward"] > 0].max()["epoch"]
-            if last_win_epoch is None or math.isnan(last_win_epoch):
-                recent_loss = abs(df_running.sum()["reward"])
-                recent_loss_times = df_running[df_running["reward"] < 0].count()["reward"]
-            else:
-                recent_loss = abs(df_running[df_running["epoch"] > last_win_epoch].sum()["reward"])
-                recent_loss_times = df_running[(df_running["epoch"] > last_win_epoch)
-                                               & (df_running["reward"] < 0)].count()["reward"]
+            bet_status = psp.ledger.status()
+            total_spent = bet_status["total_spent"]
+            max_spent = bet_status["max_spent"]
+            recent_loss = bet_status["recent_loss"]
+            recent_loss_times = bet_status["recent_loss_times"]
+            total_loss = bet_status["total_loss"]
+            loss_times = bet_status["loss_times"]
+            estimated_win = bet_status["estimated_win"]
+            win_times = bet_status["win_times"]
+            estimated_gain = bet_status["estimated_gain"]
 
             st.subheader("Overview")
             summary_df_columns = ["Total Spent", "Max Spent", "Recent Loss", "Total Loss", "Estimated Win",
@@ -127,15 +118,7 @@ def update_running(psp, plh_update):
             summary_df = pd.DataFrame(data=summary_data, columns=summary_df_columns)
             st.dataframe(summary_df)
 
-            return {"total_spent": total_spent,
-                    "max_spent": max_spent,
-                    "total_loss": total_loss,
-                    "loss_times": loss_times,
-                    "estimated_win": estimated_win,
-                    "win_times": win_times,
-                    "estimated_gain": estimated_gain,
-                    "recent_loss": recent_loss,
-                    "recent_loss_times": recent_loss_times}
+            return bet_status
 
 
 def update_history(psp, current_epoch, plh_update):
@@ -1,8 +1,9 @@
 import streamlit as st
+from strategy import registry
 from ui.wallet import update_balance
 from utils.wallet import simulate_budget
 
-STRATEGIES = ["Trend", "EMA", "Random", "Same-Before", "Bullish", "Bearish"]
+STRATEGIES = list(registry.STRATEGIES.keys())
 EPOCHS = ["All", "Odd", "Even"]
 
 
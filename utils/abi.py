@@ -1,23 +1,100 @@
-import requests
+import ast
+import functools
+import hashlib
 import json
+import os
+
+import requests
 from web3 import Web3
-from web3.middleware import geth_poa_middleware
-import streamlit as st
 
-from utils.config import config
+from utils.config import config, parent_dir
 
 
-@st.cache_data()
-def get_abi():
-    url_eth = config["general"]["abi_api"]
-    # BSC NODE
-    w3 = Web3(Web3.HTTPProvider(config["general"]["web3_provider"]))
-    w3.middleware_onion.inject(geth_poa_middleware, layer=0)
+@functools.lru_cache()
+def get_abi(address: str = None, refresh: bool = False):
+    """
+    Resolves a contract ABI without any network call when possible: first from the on-disk cache,
+    then, for the prediction contract, from the ABI bundled with the repo, and only then from bscscan.
+    Every resolved ABI is cached on disk under its contract address and content hash.
+    """
+    if address is None:
+        address = config["general"]["smart_contract"]
+    contract_address = Web3.to_checksum_address(address)
+
+    if not refresh:
+        contract_abi = _read_cache(contract_address)
+        if contract_abi is not None:
+            return contract_abi
 
-    contract_address = w3.to_checksum_address(config["general"]["smart_contract"])
+        if contract_address == Web3.to_checksum_address(config["general"]["smart_contract"]):
+            contract_abi = _read_bundled()
+            if contract_abi is not None:
+                _write_cache(contract_address, contract_abi)
+                return contract_abi
+
+    contract_abi = _fetch(contract_address)
+    _write_cache(contract_address, contract_abi)
+    return contract_abi
+
+
+def _fetch(contract_address):
+    url_eth = config["general"]["abi_api"]
     API_ENDPOINT = url_eth + "?module=contract&action=getabi&address=" + str(contract_address)
     r = requests.get(url=API_ENDPOINT)
     response = r.json()
-    contract_abi = json.loads(response["result"])
+    return json.loads(response["result"])
 
-    return contract_abi
+
+def _cache_dir(contract_address):
+    cache_dir = config["abi"]["cache_dir"]
+    if not os.path.isabs(cache_dir):
+        cache_dir = os.path.join(parent_dir, cache_dir)
+    return os.path.join(cache_dir, contract_address)
+
+
+def _read_cache(contract_address):
+    # "latest" names the content hash of the most recent version
+    cache_dir = _cache_dir(contract_address)
+    try:
+        with open(os.path.join(cache_dir, "latest"), "r", encoding="utf-8") as latest:
+            content_hash = latest.read().strip()
+        with open(os.path.join(cache_dir, f"{content_hash}.json"), "rb") as cached:
+            content = cached.read()
+    except OSError:
+        return None
+
+    # a partly written or altered file is ignored
+    if hashlib.sha256(content).hexdigest() != content_hash:
+        return None
+    return json.loads(content)
+
+
+def _write_cache(contract_address, contract_abi):
+    content = json.dumps(contract_abi, sort_keys=True).encode("utf-8")
+    content_hash = hashlib.sha256(content).hexdigest()
+
+    cache_dir = _cache_dir(contract_address)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        path = os.path.join(cache_dir, f"{content_hash}.json")
+        if not os.path.exists(path):
+            with open(path + ".tmp", "wb") as cached:
+                cached.write(content)
+            os.replace(path + ".tmp", path)
+        with open(os.path.join(cache_dir, "latest.tmp"), "w", encoding="utf-8") as latest:
+            latest.write(content_hash)
+        os.replace(os.path.join(cache_dir, "latest.tmp"), os.path.join(cache_dir, "latest"))
+    except OSError:
+        # a read-only disk only costs the cache
+        pass
+
+
+def _read_bundled():
+    # the bundled file is a Python literal: PREDICTION_ABI = [...]
+    path = os.path.join(parent_dir, config["abi"]["bundled"])
+    try:
+        with open(path, "r", encoding="utf-8") as bundled:
+            content = bundled.read()
+        return ast.literal_eval(content.split("=", 1)[1].strip())
+    except (OSError, ValueError, SyntaxError, IndexError):
+        return None
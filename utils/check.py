@@ -1,12 +1,15 @@
 def check_results(psp):
-    df_running = psp.get_running_df()
     current_epoch = psp.get_current_epoch()
 
-    unchecked_epochs = df_running[
-        (df_running["epoch"] <= current_epoch - 2)
-        &
-        (df_running["reward"] == 0)
-        ]["epoch"].tolist()
+    unchecked_epochs = psp.ledger.unchecked(current_epoch - 2)
 
     for epoch in unchecked_epochs:
         psp.claimable(epoch)
+
+
+def should_stop(params, bet_status):
+    # thresholds set to zero are ignored
+    return (0 > (params["max_loss_threshold"] * -1) >= bet_status["estimated_gain"]) or \
+        (0 < params["spend_threshold"] <= bet_status["total_spent"]) or \
+        (0 < params["gain_threshold"] <= bet_status["estimated_gain"]) or \
+        (0 < params["max_consecutive_loss"] <= bet_status["recent_loss_times"])
@@ -0,0 +1,66 @@
+from eth_utils.abi import collapse_if_tuple
+
+from utils.config import config
+
+MULTICALL3_ABI = [{"inputs": [{"components": [{"internalType": "address", "name": "target", "type": "address"},
+                                              {"internalType": "bool", "name": "allowFailure", "type": "bool"},
+                                              {"internalType": "bytes", "name": "callData", "type": "bytes"}],
+                               "internalType": "struct Multicall3.Call3[]", "name": "calls", "type": "tuple[]"}],
+                   "name": "aggregate3",
+                   "outputs": [{"components": [{"internalType": "bool", "name": "success", "type": "bool"},
+                                               {"internalType": "bytes", "name": "returnData", "type": "bytes"}],
+                                "internalType": "struct Multicall3.Result[]", "name": "returnData",
+                                "type": "tuple[]"}],
+                   "stateMutability": "payable", "type": "function"}]
+
+
+class Multicall:
+    """
+    Packs many read-only contract calls into Multicall3 `aggregate3` calls.
+    A chunk that fails as a whole falls back to one call per function, and so does
+    any single call that reverts inside an otherwise successful chunk.
+    """
+
+    def __init__(self, w3, address: str = None, chunk_size: int = None):
+        if address is None:
+            address = config["multicall"]["address"]
+        if chunk_size is None:
+            chunk_size = config["multicall"]["chunk_size"]
+
+        self.w3 = w3
+        self.chunk_size = max(1, chunk_size)
+        self.contract = w3.eth.contract(address=w3.to_checksum_address(address), abi=MULTICALL3_ABI)
+
+    def call(self, functions):
+        """Calls the given bound contract functions, e.g. `contract.functions.rounds(1)`, in order."""
+        results = []
+        for i in range(0, len(functions), self.chunk_size):
+            chunk = functions[i:i + self.chunk_size]
+            try:
+                results += self._aggregate(chunk)
+            except Exception:
+                results += [function.call() for function in chunk]
+        return results
+
+    # ---------------
+    # PRIVATE METHODS
+    # ---------------
+
+    def _aggregate(self, functions):
+        calls = [(function.address, True, function._encode_transaction_data()) for function in functions]
+        response = self.contract.functions.aggregate3(calls).call()
+
+        results = []
+        for function, (success, return_data) in zip(functions, response):
+            if success:
+                results.append(self._decode(function, return_data))
+            else:
+                results.append(function.call())
+        return results
+
+    def _decode(self, function, return_data):
+        output_types = [collapse_if_tuple(output) for output in function.abi["outputs"]]
+        values = self.w3.codec.decode(output_types, return_data)
+        if len(values) == 1:
+            return values[0]
+        return list(values)
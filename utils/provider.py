@@ -0,0 +1,155 @@
+import threading
+import time
+from collections import deque
+
+import requests
+from web3.providers.base import JSONBaseProvider
+
+from utils.config import config
+
+
+class Endpoint:
+    """Keep-alive session and rolling latency/error statistics of one JSON-RPC endpoint."""
+
+    def __init__(self, url, window):
+        self.url = url
+        self.session = requests.Session()
+        self.latencies = deque(maxlen=window)
+        self.errors = deque(maxlen=window)
+        self.consecutive_failures = 0
+        self.ejected_until = 0
+
+    def record(self, latency, failed):
+        self.errors.append(failed)
+        if failed:
+            self.consecutive_failures += 1
+        else:
+            self.latencies.append(latency)
+            self.consecutive_failures = 0
+
+    def percentile(self, q):
+        if len(self.latencies) == 0:
+            return 0
+        latencies = sorted(self.latencies)
+        return latencies[min(len(latencies) - 1, int(q * len(latencies)))]
+
+    @property
+    def p50(self):
+        return self.percentile(0.5)
+
+    @property
+    def p99(self):
+        return self.percentile(0.99)
+
+    @property
+    def error_rate(self):
+        if len(self.errors) == 0:
+            return 0
+        return sum(self.errors) / len(self.errors)
+
+    def is_healthy(self, now):
+        return now >= self.ejected_until
+
+    def stats(self):
+        return {"url": self.url,
+                "p50": self.p50,
+                "p99": self.p99,
+                "error_rate": self.error_rate,
+                "requests": len(self.errors),
+                "ejected": not self.is_healthy(time.monotonic())}
+
+
+class ProviderPool(JSONBaseProvider):
+    """
+    Web3 provider over several JSON-RPC endpoints.
+    Each request goes to the healthy endpoint with the lowest median latency and fails over to the next
+    one on connection or HTTP errors. Endpoints failing too often are ejected for a cool-down period,
+    after which they get traffic again and either recover or are ejected once more.
+    JSON-RPC error responses (e.g. reverts) are answers, not node failures, and are returned as they are.
+    Answers that never change for a chain (the chain id, which web3 checks before every call) are
+    requested once and then served from memory.
+    """
+
+    CACHED_METHODS = ("eth_chainId",)
+
+    def __init__(self, endpoints=None, window=None, timeout=None,
+                 max_error_rate=None, max_failures=None, cooldown=None):
+        super().__init__()
+        if endpoints is None:
+            endpoints = get_providers()
+        if isinstance(endpoints, str):
+            endpoints = [endpoints]
+
+        self.window = config["pool"]["window"] if window is None else window
+        self.timeout = config["pool"]["timeout"] if timeout is None else timeout
+        self.max_error_rate = config["pool"]["max_error_rate"] if max_error_rate is None else max_error_rate
+        self.max_failures = config["pool"]["max_failures"] if max_failures is None else max_failures
+        self.cooldown = config["pool"]["cooldown"] if cooldown is None else cooldown
+
+        self.endpoints = [Endpoint(url, self.window) for url in endpoints]
+        self._lock = threading.Lock()
+        self._cached_responses = {}
+
+    def make_request(self, method, params):
+        if method in self._cached_responses:
+            return self._cached_responses[method]
+
+        request_data = self.encode_rpc_request(method, params)
+
+        last_error = None
+        for endpoint in self._ranked_endpoints():
+            start = time.perf_counter()
+            try:
+                response = endpoint.session.post(endpoint.url, data=request_data, timeout=self.timeout,
+                                                 headers={"Content-Type": "application/json"})
+                response.raise_for_status()
+                raw_response = response.content
+            except requests.exceptions.RequestException as exc:
+                self._record(endpoint, time.perf_counter() - start, True)
+                last_error = exc
+                continue
+
+            self._record(endpoint, time.perf_counter() - start, False)
+            response = self.decode_rpc_response(raw_response)
+            if method in self.CACHED_METHODS and "result" in response:
+                self._cached_responses[method] = response
+            return response
+
+        raise last_error
+
+    def is_connected(self, show_traceback: bool = False):
+        return any(endpoint.is_healthy(time.monotonic()) for endpoint in self.endpoints)
+
+    def get_stats(self):
+        with self._lock:
+            return [endpoint.stats() for endpoint in self.endpoints]
+
+    # ---------------
+    # PRIVATE METHODS
+    # ---------------
+
+    def _ranked_endpoints(self):
+        # healthy endpoints fastest first, then the ejected ones as a last resort
+        now = time.monotonic()
+        with self._lock:
+            healthy = sorted((e for e in self.endpoints if e.is_healthy(now)), key=lambda e: e.p50)
+            ejected = sorted((e for e in self.endpoints if not e.is_healthy(now)), key=lambda e: e.ejected_until)
+        return healthy + ejected
+
+    def _record(self, endpoint, latency, failed):
+        with self._lock:
+            endpoint.record(latency, failed)
+            if failed and (endpoint.consecutive_failures >= self.max_failures
+                           or (len(endpoint.errors) >= self.max_failures
+                               and endpoint.error_rate > self.max_error_rate)):
+                endpoint.ejected_until = time.monotonic() + self.cooldown
+                # after the cool-down, the endpoint is judged on its new requests only
+                endpoint.errors.clear()
+                endpoint.consecutive_failures = 0
+
+
+def get_providers():
+    providers = config["general"].get("web3_providers", [])
+    if len(providers) == 0:
+        providers = [config["general"]["web3_provider"]]
+    return providers
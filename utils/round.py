@@ -1,3 +1,12 @@
+import datetime as dt
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+from web3 import Web3
+
+from utils.config import config
+
 round_columns = ["epoch",
                  "startTimestamp",
                  "lockTimestamp",
@@ -30,3 +39,113 @@ current_round_columns = ["epoch",
                          "bullAmount",
                          "bearAmount"
                          ]
+
+
+class Round(NamedTuple):
+    epoch: int
+    startTimestamp: int
+    lockTimestamp: int
+    closeTimestamp: int
+    lockPrice: float
+    closePrice: float
+    lockOracleId: int
+    closeOracleId: int
+    totalAmount: float
+    bullAmount: float
+    bearAmount: float
+    rewardBaseCalAmount: float
+    rewardAmount: float
+    oracleCalled: bool
+
+
+round_dtypes = {column: Round.__annotations__[column] for column in round_columns}
+
+
+class RoundArray:
+    """
+    Struct-of-arrays container for many rounds, one NumPy array per round column.
+    Columns are accessible as attributes (e.g. `rounds.closePrice`), and `to_df` builds
+    a DataFrame only where one is needed for display.
+    """
+
+    __slots__ = round_columns
+
+    def __init__(self, rounds=()):
+        rounds = list(rounds)
+        for i, column in enumerate(round_columns):
+            values = [data[i] for data in rounds]
+            setattr(self, column, np.array(values, dtype=round_dtypes[column]))
+
+    @classmethod
+    def from_columns(cls, columns):
+        rounds = cls.__new__(cls)
+        for column in round_columns:
+            setattr(rounds, column, np.asarray(columns[column], dtype=round_dtypes[column]))
+        return rounds
+
+    def __len__(self):
+        return len(self.epoch)
+
+    def __getitem__(self, item):
+        if isinstance(item, (int, np.integer)):
+            return Round(*(getattr(self, column)[item].item() for column in round_columns))
+        return self.from_columns({column: getattr(self, column)[item] for column in round_columns})
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def sort(self, ascending=True):
+        order = np.argsort(self.epoch, kind="stable")
+        if not ascending:
+            order = order[::-1]
+        return self[order]
+
+    def to_df(self):
+        return pd.DataFrame({column: getattr(self, column) for column in round_columns})
+
+
+def transform_round_data(data):
+    # lockOracleId and closeOracleId are not used, prices have 8 decimals and amounts are in wei
+    return Round(epoch=data[0],
+                 startTimestamp=data[1],
+                 lockTimestamp=data[2],
+                 closeTimestamp=data[3],
+                 lockPrice=data[4] / 100000000,
+                 closePrice=data[5] / 100000000,
+                 lockOracleId=0,
+                 closeOracleId=0,
+                 totalAmount=float(Web3.from_wei(data[8], 'ether')),
+                 bullAmount=float(Web3.from_wei(data[9], 'ether')),
+                 bearAmount=float(Web3.from_wei(data[10], 'ether')),
+                 rewardBaseCalAmount=float(Web3.from_wei(data[11], 'ether')),
+                 rewardAmount=float(Web3.from_wei(data[12], 'ether')),
+                 oracleCalled=data[13])
+
+
+def get_round_stats(data):
+    total_amount = data.bullAmount + data.bearAmount
+    if total_amount > 0:
+        bull_ratio = (data.bullAmount / total_amount) * 100
+        bear_ratio = (data.bearAmount / total_amount) * 100
+        # a side without deposits pays out infinitely, as the ratio did with the pandas division
+        bear_pay_ratio = total_amount / data.bearAmount if data.bearAmount > 0 else float("inf")
+        bull_pay_ratio = total_amount / data.bullAmount if data.bullAmount > 0 else float("inf")
+    else:
+        bull_ratio = None
+        bear_ratio = None
+        bear_pay_ratio = None
+        bull_pay_ratio = None
+
+    round_start_time = dt.datetime.fromtimestamp(data.startTimestamp)
+    round_bet_time = dt.datetime.fromtimestamp(data.lockTimestamp) - dt.timedelta(seconds=config["bet"]["seconds_left"])
+    round_lock_time = dt.datetime.fromtimestamp(data.lockTimestamp)
+    round_close_time = dt.datetime.fromtimestamp(data.closeTimestamp)
+
+    return {"total_amount": total_amount,
+            "bull_ratio": bull_ratio, "bear_ratio": bear_ratio,
+            "bear_pay_ratio": bear_pay_ratio, "bull_pay_ratio": bull_pay_ratio,
+            "round_start_time": round_start_time,
+            "round_bet_time": round_bet_time,
+            "round_lock_time": round_lock_time,
+            "round_close_time": round_close_time}
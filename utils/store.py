@@ -0,0 +1,147 @@
+import os
+import sqlite3
+import threading
+import time
+
+from utils.config import config, parent_dir
+from utils.round import Round, round_columns
+
+
+class RoundStore:
+    """
+    On-disk store of final rounds, keyed by epoch.
+    A round is final once the oracle has been called, or when it is long past its close time
+    (cancelled rounds never get an oracle call), and its data never changes afterwards.
+    The pool evolution of a round, rebuilt from its bet events, is kept next to it: the bull and bear
+    amounts after every block with a bet, by timestamp.
+    """
+
+    def __init__(self, path: str = None):
+        if path is None:
+            path = config["store"]["path"]
+        if not os.path.isabs(path):
+            path = os.path.join(parent_dir, path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        self.path = path
+        self.final_after = config["store"]["final_after"]
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._create_table()
+
+    def is_final(self, data):
+        if data.oracleCalled:
+            return True
+        return 0 < data.closeTimestamp < time.time() - self.final_after
+
+    def get(self, epoch):
+        with self._lock:
+            row = self._conn.execute(f"SELECT {self._columns} FROM rounds WHERE epoch = ?",
+                                     (int(epoch),)).fetchone()
+        if row is None:
+            return None
+        return self._from_row(row)
+
+    def get_many(self, epochs):
+        epochs = [int(epoch) for epoch in epochs]
+        if len(epochs) == 0:
+            return {}
+        with self._lock:
+            rows = self._conn.execute(f"SELECT {self._columns} FROM rounds WHERE epoch BETWEEN ? AND ?",
+                                      (min(epochs), max(epochs))).fetchall()
+        wanted = set(epochs)
+        return {row[0]: self._from_row(row) for row in rows if row[0] in wanted}
+
+    def get_range(self, from_epoch=None, to_epoch=None):
+        # every stored round between both epochs (inclusive), oldest first
+        with self._lock:
+            rows = self._conn.execute(f"SELECT {self._columns} FROM rounds WHERE epoch BETWEEN ? AND ? ORDER BY epoch",
+                                      (from_epoch or 0, to_epoch or 2 ** 62)).fetchall()
+        return [self._from_row(row) for row in rows]
+
+    def save(self, data):
+        self.save_many([data])
+
+    def save_many(self, rounds):
+        rows = [self._to_row(data) for data in rounds if self.is_final(data)]
+        if len(rows) == 0:
+            return
+        placeholders = ", ".join(["?"] * len(round_columns))
+        with self._lock, self._conn:
+            self._conn.executemany(f"INSERT OR REPLACE INTO rounds ({self._columns}) VALUES ({placeholders})",
+                                   rows)
+
+    def missing(self, from_epoch, to_epoch):
+        # epochs between both (inclusive) without a stored round
+        with self._lock:
+            rows = self._conn.execute("SELECT epoch FROM rounds WHERE epoch BETWEEN ? AND ?",
+                                      (from_epoch, to_epoch)).fetchall()
+        stored = {row[0] for row in rows}
+        return [epoch for epoch in range(from_epoch, to_epoch + 1) if epoch not in stored]
+
+    def save_pools(self, pools):
+        """Replaces the pool evolution of every given epoch, `{epoch: [(timestamp, bull, bear), ...]}`."""
+        rows = [(int(epoch), int(timestamp), bull_amount, bear_amount)
+                for epoch, entries in pools.items() for timestamp, bull_amount, bear_amount in entries]
+        with self._lock, self._conn:
+            self._conn.executemany("DELETE FROM pools WHERE epoch = ?", [(int(epoch),) for epoch in pools])
+            self._conn.executemany("INSERT INTO pools (epoch, timestamp, bullAmount, bearAmount) VALUES (?, ?, ?, ?)",
+                                   rows)
+
+    def get_pools(self, from_epoch=None, to_epoch=None):
+        # pool evolution of the epochs between both (inclusive) that have one, oldest entry first
+        with self._lock:
+            rows = self._conn.execute("SELECT epoch, timestamp, bullAmount, bearAmount FROM pools "
+                                      "WHERE epoch BETWEEN ? AND ? ORDER BY epoch, timestamp",
+                                      (from_epoch or 0, to_epoch or 2 ** 62)).fetchall()
+        pools = {}
+        for epoch, timestamp, bull_amount, bear_amount in rows:
+            pools.setdefault(epoch, []).append((timestamp, bull_amount, bear_amount))
+        return pools
+
+    def min_epoch(self):
+        with self._lock:
+            row = self._conn.execute("SELECT MIN(epoch) FROM rounds").fetchone()
+        return row[0]
+
+    def max_epoch(self):
+        with self._lock:
+            row = self._conn.execute("SELECT MAX(epoch) FROM rounds").fetchone()
+        return row[0]
+
+    def count(self):
+        with self._lock:
+            row = self._conn.execute("SELECT COUNT(*) FROM rounds").fetchone()
+        return row[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # ---------------
+    # PRIVATE METHODS
+    # ---------------
+
+    @property
+    def _columns(self):
+        return ", ".join(round_columns)
+
+    def _create_table(self):
+        # epoch, timestamps and the oracle flag are integers, prices and amounts are floats
+        column_types = ["INTEGER PRIMARY KEY"] + ["INTEGER"] * 3 + ["REAL"] * 9 + ["INTEGER"]
+        columns = ", ".join(f"{name} {column_type}" for name, column_type in zip(round_columns, column_types))
+        with self._lock, self._conn:
+            self._conn.execute(f"CREATE TABLE IF NOT EXISTS rounds ({columns})")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS pools "
+                               "(epoch INTEGER, timestamp INTEGER, bullAmount REAL, bearAmount REAL)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS pools_epoch ON pools (epoch)")
+
+    @staticmethod
+    def _to_row(data):
+        return [int(value) if isinstance(value, bool) else value for value in data]
+
+    @staticmethod
+    def _from_row(row):
+        return Round(*row[:13], bool(row[13]))